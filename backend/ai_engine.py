@@ -8,10 +8,9 @@ Complete AI enhancement system with:
 - Advanced Analytics
 """
 
-import openai
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union, BinaryIO
 from datetime import datetime, timezone
 from enum import Enum
 import json
@@ -26,9 +25,88 @@ import re
 from textblob import TextBlob
 import torch
 import os
+from http_clients import openai_chat
+import time
+import hashlib
+from cachetools import TTLCache
+
+try:
+    import tiktoken
+    HAVE_TIKTOKEN = True
+except ImportError:
+    HAVE_TIKTOKEN = False
+
+try:
+    import ahocorasick
+    HAVE_AHOCORASICK = True
+except ImportError:
+    HAVE_AHOCORASICK = False
 
 logger = logging.getLogger(__name__)
 
+# OpenAI account limits for the tutor model; requests wait locally instead of hitting 429s
+OPENAI_CHAT_MODEL = "gpt-4"
+OPENAI_MAX_TOKENS = 500
+OPENAI_TEMPERATURE = 0.7
+OPENAI_MAX_CONCURRENT = int(os.environ.get('OPENAI_MAX_CONCURRENT', 16))
+OPENAI_RPM = int(os.environ.get('OPENAI_RPM', 500))
+OPENAI_TPM = int(os.environ.get('OPENAI_TPM', 40_000))
+
+# Completed responses keyed by (temperature, system prompt, message); above this temperature
+# answers are meant to vary, so they aren't cached
+RESPONSE_CACHE_SIZE = 10_000
+RESPONSE_CACHE_TTL = 3600  # seconds
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.8
+
+_chat_encoding = None  # tiktoken encoding for the chat model, set by load_chat_encoding()
+
+async def load_chat_encoding():
+    """Load the tiktoken encoding once, off the event loop (it may download the BPE file)"""
+    global _chat_encoding
+    if not HAVE_TIKTOKEN or _chat_encoding is not None:
+        return
+    try:
+        _chat_encoding = await asyncio.to_thread(tiktoken.encoding_for_model, OPENAI_CHAT_MODEL)
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding, estimating tokens from length: {e}")
+
+def _estimate_tokens(text: str) -> int:
+    """Prompt token count; ~4 characters per token when the tiktoken encoding isn't loaded"""
+    if _chat_encoding is not None:
+        return len(_chat_encoding.encode(text))
+    return len(text) // 4 + 1
+
+class _TokenBucket:
+    """Requests-per-minute and tokens-per-minute budget, refilled continuously"""
+    
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()  # waiters are served in arrival order
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+    
+    async def acquire(self, tokens: int):
+        """Wait until one request and `tokens` tokens are available, then take them"""
+        tokens = min(tokens, self.tpm)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait = max((1 - self._requests) * 60 / self.rpm, (tokens - self._tokens) * 60 / self.tpm)
+                await asyncio.sleep(wait)
+
 class EmotionalState(str, Enum):
     CONFIDENT = "confident"
     FRUSTRATED = "frustrated"
@@ -52,11 +130,76 @@ class AIPersonality(str, Enum):
     PATIENT = "patient"         # Calm and methodical
     ENERGETIC = "energetic"     # Dynamic and enthusiastic
 
+_WORD_RE = re.compile(r"[a-z']+")
+
+class _KeywordMatcher:
+    """Scores labels by the distinct keywords found in a text, in one scan"""
+    
+    def __init__(self, classifier: Dict[Any, List[str]]):
+        self.labels = list(classifier)
+        # A keyword can belong to several labels (e.g. "confused")
+        self.labels_by_keyword: Dict[str, List[Any]] = defaultdict(list)
+        for label, keywords in classifier.items():
+            for keyword in keywords:
+                self.labels_by_keyword[keyword].append(label)
+        label_index = {label: i for i, label in enumerate(self.labels)}
+        self._label_indices = {
+            keyword: [label_index[label] for label in labels]
+            for keyword, labels in self.labels_by_keyword.items()
+        }
+        
+        # Single words are matched against the text's word set; only
+        # multi-word phrases ("got it", "hands-on") need a substring scan
+        self._words = frozenset(k for k in self.labels_by_keyword if _WORD_RE.fullmatch(k))
+        phrases = [k for k in self.labels_by_keyword if k not in self._words]
+        
+        self._automaton = None
+        self._pattern = None
+        if not phrases:
+            pass
+        elif HAVE_AHOCORASICK:
+            self._automaton = ahocorasick.Automaton()
+            for phrase in phrases:
+                self._automaton.add_word(phrase, phrase)
+            self._automaton.make_automaton()
+        else:
+            # Zero-width lookahead finds a match at every position; longest
+            # phrase first, with shorter phrases at the same position
+            # recovered as its prefixes
+            by_length = sorted(phrases, key=len, reverse=True)
+            self._pattern = re.compile(f"(?=({'|'.join(map(re.escape, by_length))}))")
+            self._prefixes = {
+                phrase: [p for p in by_length if phrase.startswith(p)] for phrase in by_length
+            }
+    
+    def matches(self, text_lower: str) -> set:
+        """Distinct keywords occurring in the (lowercased) text"""
+        matched = set(self._words.intersection(_WORD_RE.findall(text_lower)))
+        
+        if self._automaton is not None:
+            matched.update(phrase for _, phrase in self._automaton.iter(text_lower))
+        elif self._pattern is not None:
+            for longest in {m.group(1) for m in self._pattern.finditer(text_lower)}:
+                matched.update(self._prefixes[longest])
+        return matched
+    
+    def best(self, text_lower: str) -> Optional[Any]:
+        """Label with the most keyword hits (first in classifier order on ties), or None"""
+        scores = np.zeros(len(self.labels), dtype=np.int32)
+        for keyword in self.matches(text_lower):
+            scores[self._label_indices[keyword]] += 1
+        return self.labels[int(scores.argmax())] if scores.any() else None
+
 class AdvancedAIEngine:
     def __init__(self):
         self.emotion_classifier = None
         self.learning_style_detector = None
+        self._emotion_matcher = None
+        self._style_matcher = None
         self.voice_recognizer = sr.Recognizer()
+        self._openai_sem = asyncio.Semaphore(OPENAI_MAX_CONCURRENT)
+        self._openai_bucket = _TokenBucket(OPENAI_RPM, OPENAI_TPM)
+        self._response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
         self.ai_personalities = {
             AIPersonality.ENCOURAGING: {
                 "system_prompt": "You are StarGuide AI, an encouraging and supportive tutor. Always provide positive reinforcement, celebrate small wins, and help students build confidence. Use uplifting language and motivate students to keep trying.",
@@ -86,6 +229,7 @@ class AdvancedAIEngine:
         try:
             # Simple emotion classifier using keyword analysis (fallback method)
             self.emotion_classifier = self._create_keyword_emotion_classifier()
+            self._emotion_matcher = _KeywordMatcher(self.emotion_classifier)
             logger.info("Emotion classifier initialized successfully")
         except Exception as e:
             logger.warning(f"Could not initialize emotion classifier: {e}")
@@ -94,6 +238,7 @@ class AdvancedAIEngine:
         try:
             # Initialize learning style detector
             self.learning_style_detector = self._create_learning_style_detector()
+            self._style_matcher = _KeywordMatcher(self.learning_style_detector)
             logger.info("Learning style detector initialized successfully")
         except Exception as e:
             logger.warning(f"Could not initialize learning style detector: {e}")
@@ -148,7 +293,7 @@ class AdvancedAIEngine:
             ]
         }
 
-    async def process_voice_input(self, audio_data: bytes, user_id: str) -> Dict[str, Any]:
+    async def process_voice_input(self, audio_data: Union[bytes, BinaryIO], user_id: str) -> Dict[str, Any]:
         """Process voice input and convert to text with emotional analysis"""
         try:
             # For now, return a simulated response since we don't have the full audio processing setup
@@ -176,19 +321,9 @@ class AdvancedAIEngine:
         try:
             if self.emotion_classifier and text:
                 text_lower = text.lower()
-                emotion_scores = defaultdict(int)
-                
-                # Score emotions based on keyword matches
-                for emotion, keywords in self.emotion_classifier.items():
-                    for keyword in keywords:
-                        if keyword in text_lower:
-                            emotion_scores[emotion] += 1
                 
-                # Return emotion with highest score, or focused as default
-                if emotion_scores:
-                    return max(emotion_scores, key=emotion_scores.get)
-                else:
-                    return EmotionalState.FOCUSED
+                # Emotion with the most keyword matches, or focused as default
+                return self._emotion_matcher.best(text_lower) or EmotionalState.FOCUSED
             else:
                 return EmotionalState.FOCUSED
                 
@@ -202,18 +337,9 @@ class AdvancedAIEngine:
             return LearningStyle.MULTIMODAL
         
         text_lower = text.lower()
-        style_scores = defaultdict(int)
-        
-        for style, keywords in self.learning_style_detector.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    style_scores[style] += 1
-        
-        if not style_scores:
-            return LearningStyle.MULTIMODAL
         
         # Return the style with the highest score
-        return max(style_scores, key=style_scores.get)
+        return self._style_matcher.best(text_lower) or LearningStyle.MULTIMODAL
 
     async def generate_adaptive_response(
         self, 
@@ -221,7 +347,8 @@ class AdvancedAIEngine:
         user_context: Dict[str, Any],
         emotional_state: EmotionalState,
         learning_style: LearningStyle,
-        ai_personality: AIPersonality = AIPersonality.ENCOURAGING
+        ai_personality: AIPersonality = AIPersonality.ENCOURAGING,
+        temperature: float = OPENAI_TEMPERATURE
     ) -> Dict[str, Any]:
         """Generate adaptive AI response based on emotional state and learning style"""
         
@@ -235,7 +362,9 @@ class AdvancedAIEngine:
             )
             
             # Generate response using OpenAI
-            response = await self._generate_openai_response(message, system_prompt, user_context)
+            response = await self._generate_openai_response(
+                message, system_prompt, user_context, temperature=temperature
+            )
             
             # Add emotional intelligence enhancements
             enhanced_response = self._enhance_response_with_emotional_intelligence(
@@ -315,25 +444,42 @@ class AdvancedAIEngine:
         
         return adapted_prompt
 
-    async def _generate_openai_response(self, message: str, system_prompt: str, user_context: Dict[str, Any]) -> str:
+    async def _generate_openai_response(self, message: str, system_prompt: str, user_context: Dict[str, Any],
+                                        temperature: float = OPENAI_TEMPERATURE) -> str:
         """Generate response using OpenAI with adaptive prompting"""
         try:
+            # The system prompt already encodes personality, mood and style
+            use_cache = temperature <= RESPONSE_CACHE_MAX_TEMPERATURE
+            if use_cache:
+                cache_key = hashlib.blake2b(f"{temperature}\x00{system_prompt}\x00{message}".encode()).hexdigest()
+                cached = self._response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
             messages = [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": message}
             ]
             
-            # Use the synchronous version of the API since we're in an async function
-            response = openai.chat.completions.create(
-                model="gpt-4",
-                messages=messages,
-                max_tokens=500,
-                temperature=0.7,
-                presence_penalty=0.1,
-                frequency_penalty=0.1
-            )
+            # Budget prompt plus the completion ceiling against the TPM limit
+            est_tokens = _estimate_tokens(system_prompt + message) + OPENAI_MAX_TOKENS
+            
+            # Shared pooled async client with retries; the event loop keeps serving other requests
+            async with self._openai_sem:
+                await self._openai_bucket.acquire(est_tokens)
+                response = await openai_chat(
+                    model=OPENAI_CHAT_MODEL,
+                    messages=messages,
+                    max_tokens=OPENAI_MAX_TOKENS,
+                    temperature=temperature,
+                    presence_penalty=0.1,
+                    frequency_penalty=0.1
+                )
             
-            return response.choices[0].message.content
+            content = response.choices[0].message.content
+            if use_cache and content:
+                self._response_cache[cache_key] = content
+            return content
             
         except Exception as e:
             logger.error(f"OpenAI response generation error: {e}")
@@ -14,6 +14,7 @@ from typing import Any, Optional, Union, Dict, List
 from datetime import datetime, timedelta
 import redis
 from functools import wraps
+from cachetools import TTLCache
 import structlog
 
 # Configure structured logging
@@ -244,6 +245,47 @@ def cache_result(expire: int = 3600, key_prefix: str = "auto"):
         return wrapper
     return decorator
 
+# Decorator for short-lived in-process endpoint caching
+def ttl_cache(seconds: float = 1.0, maxsize: int = 256):
+    """Cache endpoint responses in memory for a few seconds.
+    
+    Keyed by the caller's role and the remaining keyword arguments (query
+    parameters). Concurrent misses on the same key wait on one lock so
+    only a single request recomputes the response.
+    """
+    def decorator(func):
+        cache = TTLCache(maxsize=maxsize, ttl=seconds)
+        # key -> [lock, number of callers holding or waiting on it]
+        locks: Dict[Any, List[Any]] = {}
+        
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            current_user = kwargs.get("current_user")
+            key = (getattr(current_user, "role", None),) + tuple(
+                sorted((name, value) for name, value in kwargs.items() if name != "current_user")
+            )
+            
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            
+            entry = locks.setdefault(key, [asyncio.Lock(), 0])
+            entry[1] += 1
+            try:
+                async with entry[0]:
+                    cached = cache.get(key)
+                    if cached is None:
+                        cached = await func(*args, **kwargs)
+                        cache[key] = cached
+            finally:
+                # Drop the lock only once no caller can still acquire it
+                entry[1] -= 1
+                if not entry[1]:
+                    del locks[key]
+            return cached
+        return wrapper
+    return decorator
+
 # Performance monitoring
 class CachePerformanceMonitor:
     """Monitor cache performance and provide insights"""
@@ -0,0 +1,63 @@
+"""
+Shared HTTP Clients for PathwayIQ
+Phase 2.2: Technical Infrastructure
+
+Pooled, keep-alive clients for third-party REST APIs
+"""
+
+import os
+from typing import Dict, Optional
+
+import httpx
+import openai
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
+
+CLOUDFLARE_API_BASE = "https://api.cloudflare.com/client/v4"
+
+# One pooled client per API token, so rotated or per-account tokens get their own
+_cf_clients: Dict[str, httpx.AsyncClient] = {}
+
+def get_cf_client(api_token: str) -> httpx.AsyncClient:
+    """Return the shared Cloudflare API client for a token, creating it on first use"""
+    client = _cf_clients.get(api_token)
+    if client is None or client.is_closed:
+        client = _cf_clients[api_token] = httpx.AsyncClient(
+            base_url=CLOUDFLARE_API_BASE,
+            headers={"Authorization": f"Bearer {api_token}"},
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=httpx.Timeout(10.0)
+        )
+    return client
+
+_openai_client: Optional[openai.AsyncOpenAI] = None
+
+def get_openai_client() -> openai.AsyncOpenAI:
+    """Return the shared async OpenAI client, creating it on first use"""
+    global _openai_client
+    if _openai_client is None or _openai_client.is_closed():
+        # Retries are handled by openai_chat, not the SDK
+        _openai_client = openai.AsyncOpenAI(
+            api_key=os.environ.get('OPENAI_API_KEY'), timeout=30.0, max_retries=0
+        )
+    return _openai_client
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_random_exponential(max=8),
+    retry=retry_if_exception_type((openai.RateLimitError, openai.APIConnectionError)),
+    reraise=True
+)
+async def openai_chat(**kwargs):
+    """Chat completion with retries on transient OpenAI rate-limit/connection errors"""
+    return await get_openai_client().chat.completions.create(**kwargs)
+
+async def close_http_clients():
+    """Close all shared clients (called from the app shutdown hook)"""
+    global _openai_client
+    clients = list(_cf_clients.values())
+    _cf_clients.clear()
+    for client in clients:
+        await client.aclose()
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
@@ -6,19 +6,24 @@ Chief Technical Architect Implementation
 """
 
 import asyncio
-import json
 import numpy as np
-from typing import Dict, List, Optional, Any, Tuple, Set
+from typing import Dict, List, Optional, Any, Tuple, FrozenSet
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import structlog
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
 import networkx as nx
-import openai
 import hashlib
+import json
+from collections import OrderedDict, Counter
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
 
 logger = structlog.get_logger()
 
@@ -43,6 +48,10 @@ class PathwayDifficulty(Enum):
     EXPERT = "expert"
     MIXED = "mixed"
 
+# Column order of the per-pathway format profile used in scoring
+_RESOURCE_TYPES = ('video', 'article', 'exercise', 'project', 'quiz')
+_RESOURCE_TYPE_IDX = {t: i for i, t in enumerate(_RESOURCE_TYPES)}
+
 @dataclass
 class LearningGoal:
     goal_id: str
@@ -57,7 +66,7 @@ class LearningGoal:
     career_relevance: float  # 0-1
     personal_interest: float  # 0-1
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LearningResource:
     resource_id: str
     title: str
@@ -65,15 +74,15 @@ class LearningResource:
     resource_type: str  # video, article, exercise, project, quiz
     difficulty_level: float  # 0-1
     estimated_time: int  # minutes
-    skills_covered: List[str]
-    prerequisites: List[str]
-    learning_objectives: List[str]
+    skills_covered: Tuple[str, ...]
+    prerequisites: Tuple[str, ...]
+    learning_objectives: Tuple[str, ...]
     engagement_score: float  # 0-1
     completion_rate: float  # 0-1
     user_ratings: float  # 0-5
-    tags: List[str]
+    tags: Tuple[str, ...]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PathwayStep:
     step_id: str
     step_number: int
@@ -86,8 +95,17 @@ class PathwayStep:
     prerequisites_met: bool
     mastery_criteria: Dict[str, float]
     optional: bool
+    # (resource_type, estimated_time) per resource; all that scoring reads
+    resources_light: Tuple[Tuple[str, int], ...] = ()
+    # Skill taught; full resources are built from it once a pathway is selected
+    skill: Optional[str] = None
+    
+    def __post_init__(self):
+        if not self.resources_light and self.resources:
+            object.__setattr__(self, 'resources_light',
+                               tuple((r.resource_type, r.estimated_time) for r in self.resources))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LearningPathway:
     pathway_id: str
     title: str
@@ -103,6 +121,44 @@ class LearningPathway:
     success_probability: float  # 0-1
     created_at: datetime
     updated_at: datetime
+    # Scoring features, derived once from the steps at build time
+    _skill_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    _format_counts: Dict[str, int] = field(init=False, repr=False, compare=False)
+    _format_profile: np.ndarray = field(init=False, repr=False, compare=False)
+    _format_mask: int = field(init=False, repr=False, compare=False)
+    _unmet_prereqs: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Frozen: derived fields are set through object.__setattr__
+        object.__setattr__(self, '_skill_set', frozenset(self.skill_outcomes))
+        object.__setattr__(self, '_format_counts',
+                           Counter(rtype for step in self.steps for rtype, _ in step.resources_light))
+        object.__setattr__(self, '_format_profile', _step_format_profile(self.steps))
+        object.__setattr__(self, '_format_mask', _formats_mask(self._format_counts))
+        # Steps are frozen, so prerequisites_met can't change after construction
+        object.__setattr__(self, '_unmet_prereqs', sum(not step.prerequisites_met for step in self.steps))
+
+def _formats_mask(formats) -> int:
+    """Pack resource types into a bitmask (bit i == _RESOURCE_TYPES[i])"""
+    mask = 0
+    for resource_type in formats:
+        if resource_type in _RESOURCE_TYPE_IDX:
+            mask |= 1 << _RESOURCE_TYPE_IDX[resource_type]
+    return mask
+
+def _step_format_profile(steps: List[PathwayStep]) -> np.ndarray:
+    """Per-format share of step resources, averaged over the steps"""
+    profile = np.zeros(len(_RESOURCE_TYPES))
+    for step in steps:
+        step_formats = [resource_type for resource_type, _ in step.resources_light]
+        for resource_type in set(step_formats):
+            if resource_type in _RESOURCE_TYPE_IDX:
+                profile[_RESOURCE_TYPE_IDX[resource_type]] += 1 / len(step_formats)
+    
+    if steps:
+        profile /= len(steps)
+    
+    return profile
 
 @dataclass
 class PathwayRecommendation:
@@ -115,6 +171,191 @@ class PathwayRecommendation:
     potential_challenges: List[str]
     alternative_pathways: List[str]  # pathway_ids
 
+def _score_kernel_numpy(skill_mat: np.ndarray, goal_vec: np.ndarray, goal_count: float,
+                        time_feasibility: np.ndarray, type_match: np.ndarray,
+                        format_match: np.ndarray, urgency_score: np.ndarray) -> np.ndarray:
+    """Weighted pathway score, clamped to 1.0 (NumPy fallback)"""
+    scores = (skill_mat @ goal_vec / goal_count * 0.3 + time_feasibility * 0.25 + type_match * 0.2
+              + format_match * 0.15 + urgency_score * 0.1)
+    return np.minimum(scores, 1.0)
+
+if HAVE_NUMBA:
+    # No fastmath: reassociated sums could break ties differently from the NumPy path
+    @njit(cache=True)
+    def _score_kernel(skill_mat, goal_vec, goal_count, time_feasibility, type_match,
+                      format_match, urgency_score):
+        """Weighted pathway score, clamped to 1.0 (fused, no temporaries)"""
+        n_pathways, n_skills = skill_mat.shape
+        scores = np.empty(n_pathways)
+        for p in range(n_pathways):
+            overlap = 0.0
+            for s in range(n_skills):
+                overlap += skill_mat[p, s] * goal_vec[s]
+            score = (overlap / goal_count * 0.3 + time_feasibility[p] * 0.25 + type_match[p] * 0.2
+                     + format_match[p] * 0.15 + urgency_score[p] * 0.1)
+            scores[p] = min(score, 1.0)
+        return scores
+else:
+    _score_kernel = _score_kernel_numpy
+
+_ET = attrgetter('estimated_time')
+_LIGHT_TIME = itemgetter(1)
+
+if HAVE_NUMBA:
+    # Serial and compiled on first use: it only ever sees the top_k pathways
+    @njit(cache=True)
+    def _success_kernel(times, advanced, unmet, time_budget, skill_count):
+        """Success probability per pathway; mirrors _calculate_success_probability"""
+        n_pathways = times.shape[0]
+        probabilities = np.empty(n_pathways)
+        for p in range(n_pathways):
+            probability = 0.7
+            if times[p] <= time_budget * 12:
+                probability += 0.2
+            else:
+                probability -= 0.3
+            if skill_count > 5:
+                probability += 0.1
+            elif skill_count < 2 and advanced[p]:
+                probability -= 0.3
+            probability -= unmet[p] * 0.05
+            probabilities[p] = max(0.1, min(probability, 1.0))
+        return probabilities
+
+def _id_digest(items) -> str:
+    """Short, order-independent digest of a collection of strings for pathway ids"""
+    digest = hashlib.blake2b(digest_size=4)
+    for item in sorted(items):
+        digest.update(item.encode())
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+def _settings_digest(*settings: Optional[Dict[str, Any]]) -> str:
+    """Stable digest of JSON-like settings dicts (key order doesn't matter)"""
+    payload = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+# Core programming skills hierarchy
+_PROGRAMMING_SKILLS = {
+    # Beginner level
+    'programming_basics': [],
+    'variables_data_types': ['programming_basics'],
+    'control_structures': ['variables_data_types'],
+    'functions': ['control_structures'],
+
+    # Intermediate level
+    'object_oriented_programming': ['functions'],
+    'data_structures': ['functions'],
+    'algorithms': ['data_structures'],
+    'debugging': ['functions'],
+
+    # Advanced level
+    'design_patterns': ['object_oriented_programming'],
+    'system_design': ['algorithms', 'design_patterns'],
+    'performance_optimization': ['algorithms'],
+    'testing': ['debugging'],
+
+    # Web development
+    'html_css': ['programming_basics'],
+    'javascript': ['html_css', 'functions'],
+    'frontend_frameworks': ['javascript', 'object_oriented_programming'],
+    'backend_development': ['javascript', 'data_structures'],
+    'database_design': ['backend_development'],
+    'web_security': ['backend_development'],
+
+    # Data science
+    'statistics': ['programming_basics'],
+    'data_analysis': ['statistics', 'functions'],
+    'machine_learning': ['data_analysis', 'algorithms'],
+    'data_visualization': ['data_analysis'],
+    'deep_learning': ['machine_learning'],
+
+    # DevOps
+    'version_control': ['programming_basics'],
+    'containerization': ['backend_development'],
+    'cloud_platforms': ['containerization'],
+    'ci_cd': ['version_control', 'testing'],
+}
+
+_CAREER_PATHWAYS = {
+    'frontend_developer': {
+        'title': 'Frontend Developer',
+        'core_skills': ['html_css', 'javascript', 'frontend_frameworks'],
+        'advanced_skills': ['performance_optimization', 'testing', 'web_security'],
+        'estimated_time': 480,  # 6 months
+        'difficulty': PathwayDifficulty.INTERMEDIATE
+    },
+    'backend_developer': {
+        'title': 'Backend Developer',
+        'core_skills': ['programming_basics', 'backend_development', 'database_design'],
+        'advanced_skills': ['system_design', 'web_security', 'performance_optimization'],
+        'estimated_time': 600,  # 7.5 months
+        'difficulty': PathwayDifficulty.INTERMEDIATE
+    },
+    'fullstack_developer': {
+        'title': 'Full Stack Developer',
+        'core_skills': ['html_css', 'javascript', 'frontend_frameworks', 'backend_development'],
+        'advanced_skills': ['system_design', 'database_design', 'testing'],
+        'estimated_time': 720,  # 9 months
+        'difficulty': PathwayDifficulty.ADVANCED
+    },
+    'data_scientist': {
+        'title': 'Data Scientist',
+        'core_skills': ['statistics', 'data_analysis', 'machine_learning'],
+        'advanced_skills': ['deep_learning', 'data_visualization'],
+        'estimated_time': 600,  # 7.5 months
+        'difficulty': PathwayDifficulty.ADVANCED
+    },
+    'devops_engineer': {
+        'title': 'DevOps Engineer',
+        'core_skills': ['backend_development', 'containerization', 'cloud_platforms'],
+        'advanced_skills': ['ci_cd', 'system_design'],
+        'estimated_time': 540,  # 6.75 months
+        'difficulty': PathwayDifficulty.ADVANCED
+    }
+}
+
+_RESOURCE_TIME_ESTIMATES = {
+    'video': 45,      # 45 minutes
+    'article': 30,    # 30 minutes
+    'exercise': 60,   # 1 hour
+    'project': 180,   # 3 hours
+    'quiz': 20        # 20 minutes
+}
+
+# Resource types generated for each skill, in order
+_GENERATED_RESOURCE_TYPES = ('video', 'article', 'exercise', 'project')
+
+@lru_cache(maxsize=64)
+def _selected_resource_types(preferred_formats: frozenset) -> Tuple[Tuple[int, str], ...]:
+    """(position, resource_type) of the generated resources: preferred formats, at least two"""
+    selected = []
+    for i, resource_type in enumerate(_GENERATED_RESOURCE_TYPES):
+        if resource_type in preferred_formats or len(selected) < 2:
+            selected.append((i, resource_type))
+    return tuple(selected)
+
+@lru_cache(maxsize=64)
+def _skill_resources_light(preferred_formats: frozenset) -> Tuple[Tuple[str, int], ...]:
+    """(resource_type, estimated_time) pairs, without building the resources"""
+    return tuple(
+        (resource_type, _RESOURCE_TIME_ESTIMATES.get(resource_type, 45))
+        for _, resource_type in _selected_resource_types(preferred_formats)
+    )
+
+_SKILL_DOMAINS = {
+    'web_development': ['html_css', 'javascript', 'frontend_frameworks', 'backend_development'],
+    'data_science': ['statistics', 'data_analysis', 'machine_learning', 'data_visualization'],
+    'programming_fundamentals': ['programming_basics', 'variables_data_types', 'control_structures', 'functions'],
+    'advanced_programming': ['object_oriented_programming', 'design_patterns', 'algorithms', 'system_design']
+}
+
+_ADVANCED_DIFFICULTIES = frozenset((PathwayDifficulty.ADVANCED, PathwayDifficulty.EXPERT))
+
+RECOMMENDATION_CACHE_SIZE = 1024
+RECOMMENDATION_CACHE_TTL = timedelta(minutes=15)
+SKILL_RESOURCE_CACHE_SIZE = 4096
+
 class AdvancedLearningPathRecommendationEngine:
     """Advanced learning path recommendations using AI and graph algorithms"""
     
@@ -123,11 +364,10 @@ class AdvancedLearningPathRecommendationEngine:
         self.skills_graph = nx.DiGraph()
         self.career_pathways = {}
         self.user_progress = {}
-        self.recommendation_cache = {}
+        self.recommendation_cache: "OrderedDict[Tuple[str, str, Tuple[str, ...], str], Dict[str, Any]]" = OrderedDict()
         self.skill_embeddings = {}
-        
-        # Initialize OpenAI client
-        self.openai_client = openai.OpenAI()
+        # Generated resources per (skill, generated formats the user prefers)
+        self._resource_cache: Dict[Tuple[str, FrozenSet[str]], Tuple[LearningResource, ...]] = {}
         
         # Load or create knowledge graph
         self._initialize_skills_graph()
@@ -135,94 +375,69 @@ class AdvancedLearningPathRecommendationEngine:
         
     def _initialize_skills_graph(self):
         """Initialize the skills knowledge graph"""
-        # Core programming skills hierarchy
-        programming_skills = {
-            # Beginner level
-            'programming_basics': [],
-            'variables_data_types': ['programming_basics'],
-            'control_structures': ['variables_data_types'],
-            'functions': ['control_structures'],
-            
-            # Intermediate level
-            'object_oriented_programming': ['functions'],
-            'data_structures': ['functions'],
-            'algorithms': ['data_structures'],
-            'debugging': ['functions'],
-            
-            # Advanced level
-            'design_patterns': ['object_oriented_programming'],
-            'system_design': ['algorithms', 'design_patterns'],
-            'performance_optimization': ['algorithms'],
-            'testing': ['debugging'],
-            
-            # Web development
-            'html_css': ['programming_basics'],
-            'javascript': ['html_css', 'functions'],
-            'frontend_frameworks': ['javascript', 'object_oriented_programming'],
-            'backend_development': ['javascript', 'data_structures'],
-            'database_design': ['backend_development'],
-            'web_security': ['backend_development'],
-            
-            # Data science
-            'statistics': ['programming_basics'],
-            'data_analysis': ['statistics', 'functions'],
-            'machine_learning': ['data_analysis', 'algorithms'],
-            'data_visualization': ['data_analysis'],
-            'deep_learning': ['machine_learning'],
-            
-            # DevOps
-            'version_control': ['programming_basics'],
-            'containerization': ['backend_development'],
-            'cloud_platforms': ['containerization'],
-            'ci_cd': ['version_control', 'testing'],
-        }
         
         # Add skills to graph
-        for skill, prerequisites in programming_skills.items():
+        for skill, prerequisites in _PROGRAMMING_SKILLS.items():
             self.skills_graph.add_node(skill)
             for prereq in prerequisites:
                 self.skills_graph.add_edge(prereq, skill)
         
+        # Dense adjacency over skills indexed in topological order, so the
+        # hot paths never touch NetworkX: adj[i, j] == 1 means i precedes j
+        self._skill_names: Tuple[str, ...] = tuple(nx.topological_sort(self.skills_graph))
+        self._skill_idx = {s: i for i, s in enumerate(self._skill_names)}
+        self._topo_index = self._skill_idx
+        self._adj = np.zeros((len(self._skill_names),) * 2, dtype=np.uint8)
+        for prereq, skill in self.skills_graph.edges:
+            self._adj[self._skill_idx[prereq], self._skill_idx[skill]] = 1
+        
+        self._pred_lists: List[Tuple[str, ...]] = [
+            tuple(self._skill_names[j] for j in self._pred_idx(i))
+            for i in range(len(self._skill_names))
+        ]
+        self._predecessors: Dict[str, Tuple[str, ...]] = dict(zip(self._skill_names, self._pred_lists))
+        prereq_counts = self._adj.sum(axis=0)
+        self._prereq_count = dict(zip(self._skill_names, prereq_counts.tolist()))
+        self._max_prereqs = int(prereq_counts.max())
+        self._difficulty_cache = {
+            n: min(max(c / self._max_prereqs, 0.1), 0.9) if self._max_prereqs > 0 else 0.3
+            for n, c in self._prereq_count.items()
+        }
+        
+        # Skill sets are packed into int bitmasks (bit i == skill index i)
+        self._skill_bit = {name: 1 << i for i, name in enumerate(self._skill_names)}
+        self._domain_masks = {
+            domain: self._skill_mask(domain_skills) for domain, domain_skills in _SKILL_DOMAINS.items()
+        }
+        
         logger.info(f"✅ Skills graph initialized with {len(self.skills_graph.nodes)} skills")
     
+    def _skill_mask(self, skills) -> int:
+        """Pack skill names into a bitmask; skills outside the graph are ignored"""
+        mask = 0
+        for skill in skills:
+            mask |= self._skill_bit.get(skill, 0)
+        return mask
+    
+    def _mask_skills(self, mask: int) -> List[str]:
+        """Unpack a bitmask into skill names, in topological order"""
+        skills = []
+        while mask:
+            low_bit = mask & -mask
+            skills.append(self._skill_names[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return skills
+    
+    def _pred_idx(self, i: int) -> np.ndarray:
+        """Indices of the direct prerequisites of skill index i"""
+        return np.flatnonzero(self._adj[:, i])
+    
     def _initialize_career_pathways(self):
         """Initialize career pathway templates"""
-        self.career_pathways = {
-            'frontend_developer': {
-                'title': 'Frontend Developer',
-                'core_skills': ['html_css', 'javascript', 'frontend_frameworks'],
-                'advanced_skills': ['performance_optimization', 'testing', 'web_security'],
-                'estimated_time': 480,  # 6 months
-                'difficulty': PathwayDifficulty.INTERMEDIATE
-            },
-            'backend_developer': {
-                'title': 'Backend Developer',
-                'core_skills': ['programming_basics', 'backend_development', 'database_design'],
-                'advanced_skills': ['system_design', 'web_security', 'performance_optimization'],
-                'estimated_time': 600,  # 7.5 months
-                'difficulty': PathwayDifficulty.INTERMEDIATE
-            },
-            'fullstack_developer': {
-                'title': 'Full Stack Developer',
-                'core_skills': ['html_css', 'javascript', 'frontend_frameworks', 'backend_development'],
-                'advanced_skills': ['system_design', 'database_design', 'testing'],
-                'estimated_time': 720,  # 9 months
-                'difficulty': PathwayDifficulty.ADVANCED
-            },
-            'data_scientist': {
-                'title': 'Data Scientist',
-                'core_skills': ['statistics', 'data_analysis', 'machine_learning'],
-                'advanced_skills': ['deep_learning', 'data_visualization'],
-                'estimated_time': 600,  # 7.5 months
-                'difficulty': PathwayDifficulty.ADVANCED
-            },
-            'devops_engineer': {
-                'title': 'DevOps Engineer',
-                'core_skills': ['backend_development', 'containerization', 'cloud_platforms'],
-                'advanced_skills': ['ci_cd', 'system_design'],
-                'estimated_time': 540,  # 6.75 months
-                'difficulty': PathwayDifficulty.ADVANCED
-            }
+        self.career_pathways = _CAREER_PATHWAYS
+        self._career_masks = {
+            career_id: self._skill_mask(info['core_skills'] + info['advanced_skills'])
+            for career_id, info in self.career_pathways.items()
         }
     
     async def generate_personalized_pathways(self, 
@@ -232,10 +447,28 @@ class AdvancedLearningPathRecommendationEngine:
                                            learning_preferences: Dict[str, Any],
                                            time_constraints: Optional[Dict[str, int]] = None) -> List[PathwayRecommendation]:
         """Generate personalized learning pathway recommendations"""
+        if not goals:
+            return []
+        
         try:
+            # One timestamp for the whole batch of pathways
+            now = datetime.utcnow()
+            
+            # Everything that feeds scoring is part of the key
+            cache_key = (
+                user_id,
+                self._goals_digest(goals),
+                tuple(sorted(current_skills)),
+                _settings_digest(learning_preferences, time_constraints)
+            )
+            cached = self.recommendation_cache.get(cache_key)
+            if cached and now - cached['timestamp'] < RECOMMENDATION_CACHE_TTL:
+                self.recommendation_cache.move_to_end(cache_key)
+                return cached['recommendations']
+            
             # Analyze user context
             user_context = await self._analyze_user_context(
-                user_id, goals, current_skills, learning_preferences
+                user_id, goals, current_skills, learning_preferences, now
             )
             
             # Generate candidate pathways
@@ -244,24 +477,26 @@ class AdvancedLearningPathRecommendationEngine:
             )
             
             # Score and rank pathways
-            scored_pathways = await self._score_pathways(
+            scored_pathways = self._score_pathways(
                 candidate_pathways, user_context, time_constraints
             )
             
             # Create recommendations with explanations
             recommendations = []
             for pathway, score in scored_pathways[:5]:  # Top 5 recommendations
-                recommendation = await self._create_pathway_recommendation(
+                recommendation = self._create_pathway_recommendation(
                     pathway, score, user_context
                 )
                 recommendations.append(recommendation)
             
             # Cache recommendations
-            cache_key = f"{user_id}_{hash(str(goals))}"
             self.recommendation_cache[cache_key] = {
                 'recommendations': recommendations,
-                'timestamp': datetime.utcnow()
+                'timestamp': now
             }
+            self.recommendation_cache.move_to_end(cache_key)
+            if len(self.recommendation_cache) > RECOMMENDATION_CACHE_SIZE:
+                self.recommendation_cache.popitem(last=False)
             
             logger.info(f"✅ Generated {len(recommendations)} pathway recommendations for user {user_id}")
             return recommendations
@@ -270,18 +505,30 @@ class AdvancedLearningPathRecommendationEngine:
             logger.error(f"Failed to generate personalized pathways: {e}")
             raise
     
+    def _goals_digest(self, goals: List[LearningGoal]) -> str:
+        """Stable content digest of the goals, used as a cache key"""
+        digest = hashlib.blake2b(digest_size=16)
+        for goal in goals:
+            digest.update(repr((
+                goal.goal_id, goal.goal_type.value, tuple(sorted(goal.target_skills)),
+                goal.priority, goal.career_relevance, goal.deadline
+            )).encode())
+        return digest.hexdigest()
+    
     async def _analyze_user_context(self, 
                                   user_id: str,
                                   goals: List[LearningGoal],
                                   current_skills: List[str],
-                                  preferences: Dict[str, Any]) -> Dict[str, Any]:
+                                  preferences: Dict[str, Any],
+                                  now: Optional[datetime] = None) -> Dict[str, Any]:
         """Analyze user context for pathway generation"""
+        now = now or datetime.utcnow()
         
         # Categorize goals by type and priority
         goal_analysis = {
             'career_goals': [g for g in goals if g.goal_type in [LearningGoalType.LONG_TERM] and g.career_relevance > 0.7],
             'skill_goals': [g for g in goals if g.goal_type in [LearningGoalType.SHORT_TERM, LearningGoalType.MEDIUM_TERM]],
-            'urgent_goals': [g for g in goals if g.deadline and g.deadline < datetime.utcnow() + timedelta(weeks=4)],
+            'urgent_goals': [g for g in goals if g.deadline and g.deadline < now + timedelta(weeks=4)],
             'high_priority': [g for g in goals if g.priority > 0.8]
         }
         
@@ -303,13 +550,17 @@ class AdvancedLearningPathRecommendationEngine:
         return {
             'goal_analysis': goal_analysis,
             'current_skills': set(current_skills),
+            '_skill_count': len(set(current_skills)),
             'skill_gaps': skill_gaps,
+            'skill_gap_mask': self._skill_mask(skill_gaps),
             'time_budget': time_budget,
             'learning_pace': learning_pace,
             'learning_style': learning_style,
             'preferred_formats': preferred_formats,
+            'preferred_formats_mask': _formats_mask(preferred_formats),
             'career_focus': any(g.career_relevance > 0.7 for g in goals),
-            'urgency_level': len(goal_analysis['urgent_goals']) / max(len(goals), 1)
+            'urgency_level': len(goal_analysis['urgent_goals']) / max(len(goals), 1),
+            'now': now
         }
     
     async def _generate_candidate_pathways(self, 
@@ -317,52 +568,49 @@ class AdvancedLearningPathRecommendationEngine:
                                          current_skills: List[str],
                                          user_context: Dict[str, Any]) -> List[LearningPathway]:
         """Generate candidate learning pathways"""
-        candidate_pathways = []
-        
-        # Career-based pathways
-        if user_context['career_focus']:
-            career_pathways = await self._generate_career_pathways(
-                goals, current_skills, user_context
-            )
-            candidate_pathways.extend(career_pathways)
-        
-        # Skill-based pathways
-        skill_pathways = await self._generate_skill_pathways(
-            goals, current_skills, user_context
+        # The generators are independent; _build_* methods must not mutate self
+        career_pathways, skill_pathways, project_pathways = await asyncio.gather(
+            self._generate_career_pathways(goals, current_skills, user_context),
+            self._generate_skill_pathways(goals, current_skills, user_context),
+            self._generate_project_pathways(goals, current_skills, user_context)
         )
-        candidate_pathways.extend(skill_pathways)
         
-        # Project-based pathways
-        project_pathways = await self._generate_project_pathways(
-            goals, current_skills, user_context
-        )
-        candidate_pathways.extend(project_pathways)
-        
-        return candidate_pathways
+        return career_pathways + skill_pathways + project_pathways
     
     async def _generate_career_pathways(self, 
                                       goals: List[LearningGoal],
                                       current_skills: List[str],
                                       user_context: Dict[str, Any]) -> List[LearningPathway]:
         """Generate career-focused pathways"""
-        career_pathways = []
+        if not user_context['career_focus']:
+            return []
         
+        goal_mask = 0
+        for goal in goals:
+            goal_mask |= self._skill_mask(goal.target_skills)
+        
+        tasks = []
         for career_id, career_info in self.career_pathways.items():
             # Check if this career aligns with user goals
-            required_skills = set(career_info['core_skills'] + career_info['advanced_skills'])
-            goal_skills = set()
-            for goal in goals:
-                goal_skills.update(goal.target_skills)
-            
-            skill_overlap = len(required_skills.intersection(goal_skills)) / len(required_skills)
+            required_mask = self._career_masks[career_id]
+            skill_overlap = (required_mask & goal_mask).bit_count() / required_mask.bit_count()
             
             if skill_overlap > 0.3:  # At least 30% skill overlap
-                pathway = await self._build_career_pathway(
+                tasks.append(self._build_career_pathway(
                     career_id, career_info, current_skills, user_context
-                )
-                career_pathways.append(pathway)
+                ))
         
-        return career_pathways
+        return self._collect_pathways(await asyncio.gather(*tasks, return_exceptions=True))
+    
+    def _collect_pathways(self, results: List[Any]) -> List[LearningPathway]:
+        """Drop failed builders from gathered pathway results"""
+        pathways = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Pathway builder failed: {result}")
+            else:
+                pathways.append(result)
+        return pathways
     
     async def _build_career_pathway(self, 
                                   career_id: str,
@@ -381,16 +629,16 @@ class AdvancedLearningPathRecommendationEngine:
         
         for skill in skill_order:
             if skill not in current_skills:
-                step = await self._create_skill_step(
+                step = self._create_skill_step(
                     skill, step_number, user_context
                 )
                 steps.append(step)
                 step_number += 1
         
         # Calculate total time
-        total_time = sum(step.estimated_time for step in steps) // 60  # Convert to hours
+        total_time = sum(map(_ET, steps)) // 60  # Convert to hours
         
-        pathway_id = f"career_{career_id}_{hashlib.md5(str(current_skills).encode()).hexdigest()[:8]}"
+        pathway_id = f"career_{career_id}_{_id_digest(current_skills)}"
         
         return LearningPathway(
             pathway_id=pathway_id,
@@ -405,8 +653,8 @@ class AdvancedLearningPathRecommendationEngine:
             career_paths=[career_id],
             personalization_score=0.0,  # Will be calculated later
             success_probability=0.0,  # Will be calculated later
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=user_context['now'],
+            updated_at=user_context['now']
         )
     
     def _get_optimal_skill_order(self, 
@@ -414,38 +662,34 @@ class AdvancedLearningPathRecommendationEngine:
                                 current_skills: List[str]) -> List[str]:
         """Get optimal order for learning skills based on dependencies"""
         
-        # Create subgraph of required skills
-        skill_subgraph = self.skills_graph.subgraph(required_skills)
-        
-        # Topological sort to get dependency order
-        try:
-            ordered_skills = list(nx.topological_sort(skill_subgraph))
-        except nx.NetworkXError:
-            # Fallback to original order if graph has cycles
-            ordered_skills = required_skills
+        remaining_skills = [skill for skill in required_skills if skill not in current_skills]
         
-        # Filter out skills already possessed
-        remaining_skills = [skill for skill in ordered_skills if skill not in current_skills]
+        # Fallback to original order for skills outside the graph
+        if any(skill not in self._topo_index for skill in remaining_skills):
+            return remaining_skills
         
-        return remaining_skills
+        # The global topological order is valid for any subset of skills
+        return sorted(remaining_skills, key=self._topo_index.__getitem__)
     
-    async def _create_skill_step(self, 
-                               skill: str,
-                               step_number: int,
-                               user_context: Dict[str, Any]) -> PathwayStep:
+    def _create_skill_step(self, 
+                         skill: str,
+                         step_number: int,
+                         user_context: Dict[str, Any]) -> PathwayStep:
         """Create a learning step for a specific skill"""
         
-        # Generate learning resources (mock data - would be real in production)
-        resources = await self._get_skill_resources(skill, user_context)
+        # Resource (type, time) pairs only; the resources themselves (mock
+        # data - would be real in production) are built after ranking
+        preferred_formats = frozenset(user_context['preferred_formats'])
+        resources_light = _skill_resources_light(preferred_formats)
         
         # Calculate estimated time
-        estimated_time = sum(resource.estimated_time for resource in resources)
+        estimated_time = sum(map(_LIGHT_TIME, resources_light))
         
         # Adjust for learning pace
         estimated_time = int(estimated_time / user_context['learning_pace'])
         
         # Determine prerequisites
-        prerequisites = list(self.skills_graph.predecessors(skill))
+        prerequisites = self._predecessors.get(skill, ())
         prerequisites_met = all(prereq in user_context['current_skills'] for prereq in prerequisites)
         
         step_id = f"step_{step_number}_{skill}"
@@ -456,109 +700,85 @@ class AdvancedLearningPathRecommendationEngine:
             title=f"Master {skill.replace('_', ' ').title()}",
             description=f"Learn and practice {skill.replace('_', ' ')} concepts",
             learning_objectives=[f"Understand {skill}", f"Apply {skill} in practice"],
-            resources=resources,
+            resources=[],  # built by _with_resources for the selected pathways only
             estimated_time=estimated_time,
             difficulty_progression=self._calculate_skill_difficulty(skill),
             prerequisites_met=prerequisites_met,
             mastery_criteria={'accuracy': 0.8, 'completion': 0.9},
-            optional=False
+            optional=False,
+            resources_light=resources_light,
+            skill=skill
         )
     
-    async def _get_skill_resources(self, 
-                                 skill: str,
-                                 user_context: Dict[str, Any]) -> List[LearningResource]:
-        """Get learning resources for a specific skill"""
+    def _build_skill_resources(self, skill: str, preferred_formats: frozenset) -> Tuple[LearningResource, ...]:
+        """Build (and memoize per engine) the resources for a skill and format preference"""
+        
+        # Only the generated formats affect the result
+        cache_key = (skill, preferred_formats.intersection(_GENERATED_RESOURCE_TYPES))
+        cached = self._resource_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         # Mock resource generation (would be real database in production)
         resources = []
         
-        preferred_formats = user_context['preferred_formats']
-        
         # Generate diverse resource types
-        for i, resource_type in enumerate(['video', 'article', 'exercise', 'project']):
-            if resource_type in preferred_formats or len(resources) < 2:
-                resource = LearningResource(
-                    resource_id=f"{skill}_{resource_type}_{i}",
-                    title=f"{skill.replace('_', ' ').title()} - {resource_type.title()}",
-                    description=f"Learn {skill} through {resource_type}",
-                    resource_type=resource_type,
-                    difficulty_level=self._calculate_skill_difficulty(skill),
-                    estimated_time=self._get_resource_time(resource_type),
-                    skills_covered=[skill],
-                    prerequisites=list(self.skills_graph.predecessors(skill)),
-                    learning_objectives=[f"Master {skill}"],
-                    engagement_score=0.8,
-                    completion_rate=0.75,
-                    user_ratings=4.2,
-                    tags=[skill, resource_type]
-                )
-                resources.append(resource)
+        for i, resource_type in _selected_resource_types(cache_key[1]):
+            resource = LearningResource(
+                resource_id=f"{skill}_{resource_type}_{i}",
+                title=f"{skill.replace('_', ' ').title()} - {resource_type.title()}",
+                description=f"Learn {skill} through {resource_type}",
+                resource_type=resource_type,
+                difficulty_level=self._calculate_skill_difficulty(skill),
+                estimated_time=self._get_resource_time(resource_type),
+                skills_covered=(skill,),
+                prerequisites=tuple(self._predecessors.get(skill, ())),
+                learning_objectives=(f"Master {skill}",),
+                engagement_score=0.8,
+                completion_rate=0.75,
+                user_ratings=4.2,
+                tags=(skill, resource_type)
+            )
+            resources.append(resource)
         
-        return resources
+        if len(self._resource_cache) >= SKILL_RESOURCE_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._resource_cache[next(iter(self._resource_cache))]
+        self._resource_cache[cache_key] = cached = tuple(resources)
+        return cached
     
     def _calculate_skill_difficulty(self, skill: str) -> float:
         """Calculate difficulty level for a skill"""
-        # Base difficulty on position in skills graph
-        try:
-            # Skills with more prerequisites are generally more difficult
-            prereq_count = len(list(self.skills_graph.predecessors(skill)))
-            max_prereqs = max(len(list(self.skills_graph.predecessors(node))) 
-                            for node in self.skills_graph.nodes())
-            
-            if max_prereqs > 0:
-                difficulty = prereq_count / max_prereqs
-            else:
-                difficulty = 0.3  # Default for skills with no prerequisites
-            
-            return min(max(difficulty, 0.1), 0.9)  # Clamp between 0.1 and 0.9
-            
-        except Exception:
-            return 0.5  # Default difficulty
+        # Based on prerequisite count, precomputed in _initialize_skills_graph
+        return self._difficulty_cache.get(skill, 0.5)
     
     def _get_resource_time(self, resource_type: str) -> int:
         """Get estimated time for resource type"""
-        time_estimates = {
-            'video': 45,      # 45 minutes
-            'article': 30,    # 30 minutes
-            'exercise': 60,   # 1 hour
-            'project': 180,   # 3 hours
-            'quiz': 20        # 20 minutes
-        }
-        return time_estimates.get(resource_type, 45)
+        return _RESOURCE_TIME_ESTIMATES.get(resource_type, 45)
     
     async def _generate_skill_pathways(self, 
                                      goals: List[LearningGoal],
                                      current_skills: List[str],
                                      user_context: Dict[str, Any]) -> List[LearningPathway]:
         """Generate skill-focused pathways"""
-        skill_pathways = []
-        
         # Group skills by domain
-        skill_domains = self._group_skills_by_domain(user_context['skill_gaps'])
+        skill_domains = self._group_skills_by_domain(user_context['skill_gap_mask'])
         
-        for domain, skills in skill_domains.items():
-            if len(skills) >= 2:  # Only create pathway if multiple skills
-                pathway = await self._build_skill_domain_pathway(
-                    domain, skills, current_skills, user_context
-                )
-                skill_pathways.append(pathway)
+        tasks = [
+            self._build_skill_domain_pathway(domain, skills, current_skills, user_context)
+            for domain, skills in skill_domains.items()
+            if len(skills) >= 2  # Only create pathway if multiple skills
+        ]
         
-        return skill_pathways
+        return self._collect_pathways(await asyncio.gather(*tasks, return_exceptions=True))
     
-    def _group_skills_by_domain(self, skills: Set[str]) -> Dict[str, List[str]]:
-        """Group skills by domain/category"""
-        domains = {
-            'web_development': ['html_css', 'javascript', 'frontend_frameworks', 'backend_development'],
-            'data_science': ['statistics', 'data_analysis', 'machine_learning', 'data_visualization'],
-            'programming_fundamentals': ['programming_basics', 'variables_data_types', 'control_structures', 'functions'],
-            'advanced_programming': ['object_oriented_programming', 'design_patterns', 'algorithms', 'system_design']
-        }
-        
+    def _group_skills_by_domain(self, skills_mask: int) -> Dict[str, List[str]]:
+        """Group skills (as a bitmask) by domain/category"""
         skill_groups = {}
-        for domain, domain_skills in domains.items():
-            matching_skills = [skill for skill in skills if skill in domain_skills]
-            if matching_skills:
-                skill_groups[domain] = matching_skills
+        for domain, domain_mask in self._domain_masks.items():
+            matching_mask = skills_mask & domain_mask
+            if matching_mask:
+                skill_groups[domain] = self._mask_skills(matching_mask)
         
         return skill_groups
     
@@ -575,13 +795,13 @@ class AdvancedLearningPathRecommendationEngine:
         # Create steps
         steps = []
         for i, skill in enumerate(ordered_skills, 1):
-            step = await self._create_skill_step(skill, i, user_context)
+            step = self._create_skill_step(skill, i, user_context)
             steps.append(step)
         
         # Calculate total time
-        total_time = sum(step.estimated_time for step in steps) // 60
+        total_time = sum(map(_ET, steps)) // 60
         
-        pathway_id = f"skill_{domain}_{hashlib.md5(str(skills).encode()).hexdigest()[:8]}"
+        pathway_id = f"skill_{domain}_{_id_digest(skills)}"
         
         return LearningPathway(
             pathway_id=pathway_id,
@@ -596,8 +816,8 @@ class AdvancedLearningPathRecommendationEngine:
             career_paths=[],
             personalization_score=0.0,
             success_probability=0.0,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=user_context['now'],
+            updated_at=user_context['now']
         )
     
     async def _generate_project_pathways(self, 
@@ -609,7 +829,7 @@ class AdvancedLearningPathRecommendationEngine:
         project_pathways = []
         
         # Example project pathway
-        if 'web_development' in self._group_skills_by_domain(user_context['skill_gaps']):
+        if 'web_development' in self._group_skills_by_domain(user_context['skill_gap_mask']):
             project_pathway = await self._create_web_project_pathway(current_skills, user_context)
             project_pathways.append(project_pathway)
         
@@ -650,82 +870,108 @@ class AdvancedLearningPathRecommendationEngine:
             career_paths=['frontend_developer'],
             personalization_score=0.0,
             success_probability=0.0,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=user_context['now'],
+            updated_at=user_context['now']
         )
     
-    async def _score_pathways(self, 
-                            pathways: List[LearningPathway],
-                            user_context: Dict[str, Any],
-                            time_constraints: Optional[Dict[str, int]]) -> List[Tuple[LearningPathway, float]]:
-        """Score and rank pathways based on user context"""
+    def _score_pathways(self, 
+                        pathways: List[LearningPathway],
+                        user_context: Dict[str, Any],
+                        time_constraints: Optional[Dict[str, int]],
+                        top_k: int = 5) -> List[Tuple[LearningPathway, float]]:
+        """Score pathways and return the top_k, best first"""
         
-        scored_pathways = []
+        if not pathways:
+            return []
         
-        for pathway in pathways:
-            score = await self._calculate_pathway_score(pathway, user_context, time_constraints)
-            
-            # Update pathway with score
-            pathway.personalization_score = score
-            pathway.success_probability = self._calculate_success_probability(pathway, user_context)
+        scores = self._calculate_pathway_scores(pathways, user_context, time_constraints)
+        
+        # Highest first; the stable sort keeps generation order among ties
+        top = np.argsort(-scores, kind='stable')[:top_k]
+        
+        top_pathways = [pathways[i] for i in top.tolist()]
+        preferred_formats = frozenset(user_context['preferred_formats'])
+        probabilities = self._success_probabilities(top_pathways, user_context)
+        
+        scored_pathways = []
+        for pathway, score, probability in zip(top_pathways, scores[top].tolist(), probabilities):
+            # Pathways are frozen; attach the scores and full resources on a copy
+            pathway = replace(
+                pathway,
+                steps=self._with_resources(pathway.steps, preferred_formats),
+                personalization_score=score,
+                success_probability=probability
+            )
             
             scored_pathways.append((pathway, score))
         
-        # Sort by score (highest first)
-        scored_pathways.sort(key=lambda x: x[1], reverse=True)
-        
         return scored_pathways
     
-    async def _calculate_pathway_score(self, 
-                                     pathway: LearningPathway,
-                                     user_context: Dict[str, Any],
-                                     time_constraints: Optional[Dict[str, int]]) -> float:
-        """Calculate relevance score for a pathway"""
+    def _with_resources(self, steps: List[PathwayStep], preferred_formats: frozenset) -> List[PathwayStep]:
+        """Copies of the steps with their full LearningResource lists"""
+        return [
+            replace(step, resources=list(self._build_skill_resources(step.skill, preferred_formats)))
+            if step.skill is not None and not step.resources else step
+            for step in steps
+        ]
+    
+    def _calculate_pathway_scores(self, 
+                                  pathways: List[LearningPathway],
+                                  user_context: Dict[str, Any],
+                                  time_constraints: Optional[Dict[str, int]]) -> np.ndarray:
+        """Calculate relevance scores for all candidate pathways at once"""
         
-        score = 0.0
+        n_pathways = len(pathways)
+        totals = np.array([p.total_estimated_time for p in pathways], dtype=np.float64)
         
-        # Goal alignment (30% weight)
+        # Goal alignment (30% weight): (P, S) outcome matrix against the skill gaps
         goal_skills = user_context['skill_gaps']
-        pathway_skills = set(pathway.skill_outcomes)
-        skill_overlap = len(goal_skills.intersection(pathway_skills)) / max(len(goal_skills), 1)
-        score += skill_overlap * 0.3
+        skill_matrix = np.zeros((n_pathways, len(self._skill_names)))
+        for row, pathway in enumerate(pathways):
+            skill_matrix[row, [self._skill_idx[s] for s in pathway._skill_set if s in self._skill_idx]] = 1.0
+        goal_vec = np.zeros(len(self._skill_names))
+        goal_vec[[self._skill_idx[s] for s in goal_skills if s in self._skill_idx]] = 1.0
         
-        # Time feasibility (25% weight)
+        # Time feasibility (25% weight); full score if no time constraints
         if time_constraints:
-            max_time = time_constraints.get('max_total_time', pathway.total_estimated_time)
-            time_feasibility = min(max_time / max(pathway.total_estimated_time, 1), 1.0)
-            score += time_feasibility * 0.25
+            max_time = np.full(n_pathways, time_constraints['max_total_time'], dtype=np.float64) \
+                if 'max_total_time' in time_constraints else totals
+            time_feasibility = np.minimum(max_time / np.maximum(totals, 1), 1.0)
         else:
-            score += 0.25  # Full score if no time constraints
+            time_feasibility = np.ones(n_pathways)
         
         # Career relevance (20% weight)
-        if user_context['career_focus'] and pathway.pathway_type == PathwayType.CAREER_FOCUSED:
-            score += 0.2
-        elif not user_context['career_focus'] and pathway.pathway_type == PathwayType.SKILL_BASED:
-            score += 0.2
+        preferred_type = PathwayType.CAREER_FOCUSED if user_context['career_focus'] else PathwayType.SKILL_BASED
+        type_match = np.array([p.pathway_type == preferred_type for p in pathways], dtype=np.float64)
         
-        # Learning style match (15% weight)
-        preferred_formats = user_context['preferred_formats']
-        format_match = 0.0
-        for step in pathway.steps:
-            step_formats = [resource.resource_type for resource in step.resources]
-            format_overlap = len(set(step_formats).intersection(set(preferred_formats)))
-            format_match += format_overlap / max(len(step_formats), 1)
+        # Learning style match (15% weight): (P, F) format profiles against preferred formats
+        format_matrix = np.stack([p._format_profile for p in pathways])
+        preferred_vec = np.zeros(len(_RESOURCE_TYPES))
+        preferred_vec[[_RESOURCE_TYPE_IDX[f] for f in set(user_context['preferred_formats']) if f in _RESOURCE_TYPE_IDX]] = 1.0
+        format_match = format_matrix @ preferred_vec
         
-        if pathway.steps:
-            format_match /= len(pathway.steps)
-        
-        score += format_match * 0.15
-        
-        # Urgency match (10% weight)
+        # Urgency match (10% weight): prefer shorter pathways for urgent goals
         if user_context['urgency_level'] > 0.5:
-            # Prefer shorter pathways for urgent goals
-            urgency_score = 1.0 - (pathway.total_estimated_time / 1000)  # Normalize
-            score += max(urgency_score, 0) * 0.1
+            urgency_score = np.maximum(1.0 - totals / 1000, 0)  # Normalize
         else:
-            score += 0.1  # Full score if no urgency
+            urgency_score = np.ones(n_pathways)
         
-        return min(score, 1.0)  # Clamp to maximum 1.0
+        return _score_kernel(skill_matrix, goal_vec, float(max(len(goal_skills), 1)),
+                             time_feasibility, type_match, format_match, urgency_score)
+    
+    def _success_probabilities(self, 
+                               pathways: List[LearningPathway],
+                               user_context: Dict[str, Any]) -> List[float]:
+        """Success probabilities for several pathways (one JIT pass when numba is available)"""
+        if not HAVE_NUMBA:
+            return [self._calculate_success_probability(p, user_context) for p in pathways]
+        
+        times = np.array([p.total_estimated_time for p in pathways], dtype=np.float64)
+        advanced = np.array([p.difficulty in _ADVANCED_DIFFICULTIES for p in pathways], dtype=np.int8)
+        unmet = np.array([p._unmet_prereqs for p in pathways], dtype=np.int64)
+        return _success_kernel(
+            times, advanced, unmet, float(user_context['time_budget']), user_context['_skill_count']
+        ).tolist()
     
     def _calculate_success_probability(self, 
                                      pathway: LearningPathway,
@@ -734,36 +980,31 @@ class AdvancedLearningPathRecommendationEngine:
         
         probability = 0.7  # Base probability
         
-        # Adjust based on time budget
-        required_weekly_hours = pathway.total_estimated_time / 12  # Assume 12 weeks
-        if required_weekly_hours <= user_context['time_budget']:
+        # Adjust based on time budget (weekly hours over an assumed 12 weeks)
+        if pathway.total_estimated_time <= user_context['time_budget'] * 12:
             probability += 0.2
         else:
             probability -= 0.3
         
         # Adjust based on difficulty vs current skills
-        current_skill_count = len(user_context['current_skills'])
+        current_skill_count = user_context['_skill_count']
         if current_skill_count > 5:  # Experienced learner
             probability += 0.1
         elif current_skill_count < 2:  # Beginner
-            if pathway.difficulty in [PathwayDifficulty.ADVANCED, PathwayDifficulty.EXPERT]:
+            if pathway.difficulty in _ADVANCED_DIFFICULTIES:
                 probability -= 0.3
         
         # Adjust based on prerequisites
-        unmet_prereqs = 0
-        for step in pathway.steps:
-            if not step.prerequisites_met:
-                unmet_prereqs += 1
-        
+        unmet_prereqs = pathway._unmet_prereqs
         if unmet_prereqs > 0:
             probability -= unmet_prereqs * 0.05
         
         return max(0.1, min(probability, 1.0))  # Clamp between 0.1 and 1.0
     
-    async def _create_pathway_recommendation(self, 
-                                           pathway: LearningPathway,
-                                           score: float,
-                                           user_context: Dict[str, Any]) -> PathwayRecommendation:
+    def _create_pathway_recommendation(self, 
+                                       pathway: LearningPathway,
+                                       score: float,
+                                       user_context: Dict[str, Any]) -> PathwayRecommendation:
         """Create detailed pathway recommendation with explanations"""
         
         # Generate reasoning
@@ -780,13 +1021,7 @@ class AdvancedLearningPathRecommendationEngine:
         if pathway.pathway_type == PathwayType.CAREER_FOCUSED and user_context['career_focus']:
             personalization_factors.append("Aligned with your career goals")
         
-        preferred_formats = user_context['preferred_formats']
-        pathway_formats = set()
-        for step in pathway.steps:
-            for resource in step.resources:
-                pathway_formats.add(resource.resource_type)
-        
-        if pathway_formats.intersection(preferred_formats):
+        if pathway._format_mask & user_context['preferred_formats_mask']:
             personalization_factors.append("Matches your preferred learning formats")
         
         # Success indicators
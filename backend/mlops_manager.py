@@ -6,19 +6,42 @@ Chief Technical Architect Implementation
 """
 
 import asyncio
+import copy
+import heapq
 import json
 import hashlib
 import uuid
-from typing import Dict, List, Optional, Any, Union, Callable
+from typing import Dict, List, Optional, Any, Union, Callable, Literal, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, fields
 from enum import Enum
 import structlog
+import joblib
 import pickle
 import numpy as np
+import pandas as pd
 from pathlib import Path
 import tempfile
 import os
+import time
+from collections import deque
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from blake3 import blake3
+    HAVE_BLAKE3 = True
+except ImportError:
+    HAVE_BLAKE3 = False
 
 logger = structlog.get_logger()
 
@@ -42,7 +65,7 @@ class DeploymentEnvironment(Enum):
     STAGING = "staging"
     PRODUCTION = "production"
 
-@dataclass
+@dataclass(slots=True)
 class ModelMetadata:
     model_id: str
     name: str
@@ -57,8 +80,9 @@ class ModelMetadata:
     training_data_hash: str
     model_size_mb: float
     creator: str
+    quantization: Optional[Dict[str, Any]] = None  # mode, scale and weight sizes if quantized
 
-@dataclass
+@dataclass(slots=True)
 class ModelExperiment:
     experiment_id: str
     model_id: str
@@ -70,13 +94,100 @@ class ModelExperiment:
     status: str
     logs: List[str]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DeploymentConfig:
     environment: DeploymentEnvironment
     resource_requirements: Dict[str, Any]
     scaling_config: Dict[str, Any]
     health_check_config: Dict[str, Any]
     rollback_strategy: str
+    _as_dict: Dict[str, Any] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Frozen, so the deployment-record view is built once
+        object.__setattr__(self, '_as_dict', {f.name: getattr(self, f.name) for f in fields(self) if f.init})
+    
+    @property
+    def as_dict(self) -> Dict[str, Any]:
+        """Field dict for deployment records (shared; do not mutate)"""
+        return self._as_dict
+
+def _hash_training_data(data: Union[np.ndarray, str, Path]) -> str:
+    """Content hash of training data (an array, or a file streamed via mmap)"""
+    if isinstance(data, (str, Path)):
+        if HAVE_BLAKE3:
+            return blake3().update_mmap(str(data)).hexdigest()
+        with open(data, 'rb') as f:
+            return hashlib.file_digest(f, 'blake2b').hexdigest()
+    
+    buffer = data if data.flags['C_CONTIGUOUS'] else np.ascontiguousarray(data)
+    if HAVE_BLAKE3:
+        return blake3(memoryview(buffer).cast('B')).hexdigest()
+    return hashlib.blake2b(memoryview(buffer).cast('B')).hexdigest()
+
+_SKLEARN_WEIGHT_ATTRS = ('coef_', 'intercept_')
+
+def _quantize_model(model_object: Any, mode: str) -> Tuple[Any, Dict[str, Any]]:
+    """Quantized copy of the model's weights, plus a record of what was done"""
+    info: Dict[str, Any] = {'mode': mode, 'scale': None}
+    
+    if isinstance(model_object, np.ndarray):
+        weights = model_object.astype(np.float32, copy=False)
+        if mode == 'fp16':
+            quantized = weights.astype(np.float16)
+        else:
+            # Symmetric per-tensor int8: w ~= q * scale
+            max_abs = float(np.abs(weights).max()) if weights.size else 0.0
+            scale = max_abs / 127 if max_abs > 0 else 1.0
+            quantized = np.round(weights * (1 / scale)).astype(np.int8)
+            info['scale'] = scale
+        info['original_weights_mb'] = model_object.nbytes / (1024 * 1024)
+        info['quantized_weights_mb'] = quantized.nbytes / (1024 * 1024)
+        return quantized, info
+    
+    if mode != 'fp16':
+        raise ValueError("int8 quantization is only supported for array models")
+    
+    if hasattr(model_object, 'state_dict') and hasattr(model_object, 'half'):
+        # torch module
+        quantized = copy.deepcopy(model_object).half()
+        return quantized, info
+    
+    attrs = [attr for attr in _SKLEARN_WEIGHT_ATTRS if isinstance(getattr(model_object, attr, None), np.ndarray)]
+    if not attrs:
+        raise ValueError(f"Don't know how to quantize {type(model_object).__name__}")
+    
+    quantized = copy.copy(model_object)
+    original_bytes = quantized_bytes = 0
+    for attr in attrs:
+        weights = getattr(model_object, attr)
+        setattr(quantized, attr, weights.astype(np.float16))
+        original_bytes += weights.nbytes
+        quantized_bytes += getattr(quantized, attr).nbytes
+    info['original_weights_mb'] = original_bytes / (1024 * 1024)
+    info['quantized_weights_mb'] = quantized_bytes / (1024 * 1024)
+    return quantized, info
+
+def _json_default(obj: Any) -> Any:
+    """json.dumps fallback for the types orjson serializes natively"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes; datetimes, enums and arrays are handled natively"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_json_default).encode()
+
+PREDICT_BATCH_WINDOW = 0.005  # seconds to wait for more predict_coalesced() calls
+
+PREDICTION_HISTORY_SIZE = 1000
+_PREDICTION_HISTORY_DTYPE = np.dtype([('pid', '<U36'), ('t_ns', 'i8'), ('dt', 'f8')])
 
 class MLModelManager:
     """Manage ML models with versioning and lifecycle"""
@@ -87,6 +198,8 @@ class MLModelManager:
         self.models_registry = {}
         self.active_models = {}
         self.model_metrics = {}
+        self._pending_batches: Dict[str, Dict[str, Any]] = {}
+        self._batch_tasks = set()
         
     async def register_model(self, 
                            name: str,
@@ -96,18 +209,26 @@ class MLModelManager:
                            description: str = "",
                            hyperparameters: Optional[Dict] = None,
                            training_data_hash: str = "",
-                           creator: str = "system") -> str:
+                           creator: str = "system",
+                           training_data: Optional[Union[np.ndarray, str, Path]] = None,
+                           quantize: Optional[Literal['fp16', 'int8']] = None) -> str:
         """Register a new model"""
         try:
             model_id = str(uuid.uuid4())
-            model_path = self.model_store_path / f"{model_id}.pkl"
             
-            # Serialize and save model
-            with open(model_path, 'wb') as f:
-                pickle.dump(model_object, f)
+            if training_data is not None and not training_data_hash:
+                training_data_hash = await asyncio.to_thread(_hash_training_data, training_data)
             
-            # Calculate model size
-            model_size_mb = model_path.stat().st_size / (1024 * 1024)
+            quantization = None
+            if quantize:
+                model_object, quantization = await asyncio.to_thread(_quantize_model, model_object, quantize)
+                logger.warning(
+                    f"Model {name} quantized to {quantize}; accuracy may shift by more than 1% "
+                    f"(weights {quantization.get('original_weights_mb')} MB -> {quantization.get('quantized_weights_mb')} MB)"
+                )
+            
+            # Serialize and size the artifact off the event loop
+            model_size_mb = await asyncio.to_thread(self._save_model_sync, model_id, model_object)
             
             # Create metadata
             metadata = ModelMetadata(
@@ -123,9 +244,14 @@ class MLModelManager:
                 hyperparameters=hyperparameters or {},
                 training_data_hash=training_data_hash,
                 model_size_mb=model_size_mb,
-                creator=creator
+                creator=creator,
+                quantization=quantization
             )
             
+            # Sidecar metadata, readable without loading the artifact
+            sidecar = _dumps(asdict(metadata))
+            await asyncio.to_thread((self.model_store_path / f"{model_id}.json").write_bytes, sidecar)
+            
             # Register model
             self.models_registry[model_id] = metadata
             
@@ -136,22 +262,55 @@ class MLModelManager:
             logger.error(f"Model registration failed: {e}")
             raise
     
+    def _artifact_path(self, model_id: str) -> Path:
+        """Path of a model's stored artifact (.npy for arrays, .joblib otherwise)"""
+        npy_path = self.model_store_path / f"{model_id}.npy"
+        return npy_path if npy_path.exists() else self.model_store_path / f"{model_id}.joblib"
+    
+    def _save_model_sync(self, model_id: str, model_object: Any) -> float:
+        """Write a model artifact and return its size in MB (blocking; run in a thread)"""
+        # Arrays are stored as .npy so they can be memory-mapped on load;
+        # anything else goes through joblib (which also mmaps its arrays)
+        if isinstance(model_object, np.ndarray):
+            model_path = self.model_store_path / f"{model_id}.npy"
+            np.save(model_path, model_object)
+        else:
+            model_path = self.model_store_path / f"{model_id}.joblib"
+            joblib.dump(model_object, model_path, compress=0, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        return model_path.stat().st_size / (1024 * 1024)
+    
+    def _load_model_sync(self, model_id: str, quantization: Optional[Dict[str, Any]]) -> Any:
+        """Read a model artifact from storage (blocking; run in a thread)"""
+        model_path = self._artifact_path(model_id)
+        
+        if not model_path.exists():
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+        
+        # Memory-mapped: pages are faulted in on use and shared across loads
+        if model_path.suffix == '.npy':
+            model = np.load(model_path, mmap_mode='r')
+            if quantization and quantization['mode'] == 'int8':
+                # Dequantize int8 weights for inference
+                model = model.astype(np.float32) * quantization['scale']
+            return model
+        
+        return joblib.load(model_path, mmap_mode='r')
+    
     async def load_model(self, model_id: str) -> Any:
         """Load model from storage"""
         try:
             if model_id not in self.models_registry:
                 raise ValueError(f"Model {model_id} not found in registry")
             
-            model_path = self.model_store_path / f"{model_id}.pkl"
-            
-            if not model_path.exists():
-                raise FileNotFoundError(f"Model file not found: {model_path}")
+            metadata = self.models_registry[model_id]
             
-            with open(model_path, 'rb') as f:
-                model = pickle.load(f)
+            # File checks and deserialization stay off the event loop, so
+            # concurrent deploys and requests don't queue behind one load
+            model = await asyncio.to_thread(self._load_model_sync, model_id, metadata.quantization)
             
             # Update last accessed time
-            self.models_registry[model_id].updated_at = datetime.utcnow()
+            metadata.updated_at = datetime.utcnow()
             
             return model
             
@@ -179,8 +338,8 @@ class MLModelManager:
                 'deployment_id': deployment_id,
                 'model_id': model_id,
                 'environment': environment.value,
-                'deployed_at': datetime.utcnow().isoformat(),
-                'config': asdict(config) if config else {},
+                'deployed_at': datetime.utcnow(),
+                'config': config.as_dict if config else {},
                 'status': 'active'
             }
             
@@ -217,8 +376,8 @@ class MLModelManager:
             model = deployment['model']
             metadata = deployment['metadata']
             
-            # Make prediction
-            start_time = datetime.utcnow()
+            # Make prediction (timed with the monotonic perf counter)
+            t0 = time.perf_counter_ns()
             
             if hasattr(model, 'predict'):
                 prediction = model.predict(input_data)
@@ -227,12 +386,12 @@ class MLModelManager:
             else:
                 raise ValueError("Model does not have predict or forward method")
             
-            end_time = datetime.utcnow()
-            inference_time = (end_time - start_time).total_seconds()
+            inference_time = (time.perf_counter_ns() - t0) * 1e-9
+            ts_ns = time.time_ns()
             
             # Log prediction metrics
             prediction_id = str(uuid.uuid4())
-            self._log_prediction_metrics(model_id, prediction_id, inference_time)
+            self._log_prediction_metrics(model_id, prediction_id, inference_time, ts_ns)
             
             return {
                 'prediction_id': prediction_id,
@@ -241,20 +400,109 @@ class MLModelManager:
                 'model_version': metadata.version,
                 'prediction': prediction.tolist() if hasattr(prediction, 'tolist') else prediction,
                 'inference_time_seconds': inference_time,
-                'timestamp': end_time.isoformat()
+                'timestamp': datetime.utcfromtimestamp(ts_ns / 1e9)
             }
             
         except Exception as e:
             logger.error(f"Prediction failed: {e}")
             raise
     
-    def _log_prediction_metrics(self, model_id: str, prediction_id: str, inference_time: float):
+    async def predict_batch(self, 
+                           model_id: str, 
+                           environment: DeploymentEnvironment,
+                           inputs: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """Make predictions for same-shaped inputs with a single model call"""
+        try:
+            deployment_key = f"{environment.value}_{model_id}"
+            
+            if deployment_key not in self.active_models:
+                raise ValueError(f"Model {model_id} not deployed in {environment.value}")
+            
+            deployment = self.active_models[deployment_key]
+            model = deployment['model']
+            metadata = deployment['metadata']
+            
+            # One stacked call lets the backend run a single batched kernel
+            stacked = np.stack(inputs)
+            t0 = time.perf_counter_ns()
+            
+            if hasattr(model, 'predict'):
+                predictions = model.predict(stacked)
+            elif hasattr(model, 'forward'):
+                predictions = model.forward(stacked)
+            else:
+                raise ValueError("Model does not have predict or forward method")
+            
+            # predict_coalesced hands row i to waiter i, so the rows must line up
+            if len(predictions) != len(inputs):
+                raise ValueError(
+                    f"Model {model_id} returned {len(predictions)} predictions for {len(inputs)} inputs"
+                )
+            
+            inference_time = (time.perf_counter_ns() - t0) * 1e-9 / len(inputs)
+            ts_ns = time.time_ns()
+            timestamp = datetime.utcfromtimestamp(ts_ns / 1e9)
+            
+            results = []
+            for prediction in predictions:
+                prediction_id = str(uuid.uuid4())
+                self._log_prediction_metrics(model_id, prediction_id, inference_time, ts_ns)
+                results.append({
+                    'prediction_id': prediction_id,
+                    'model_id': model_id,
+                    'model_name': metadata.name,
+                    'model_version': metadata.version,
+                    'prediction': prediction.tolist() if hasattr(prediction, 'tolist') else prediction,
+                    'inference_time_seconds': inference_time,
+                    'timestamp': timestamp
+                })
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch prediction failed: {e}")
+            raise
+    
+    async def predict_coalesced(self, 
+                               model_id: str, 
+                               environment: DeploymentEnvironment,
+                               input_data: np.ndarray) -> Dict[str, Any]:
+        """Single prediction merged with others arriving within PREDICT_BATCH_WINDOW"""
+        deployment_key = f"{environment.value}_{model_id}"
+        batch = self._pending_batches.get(deployment_key)
+        if batch is None:
+            loop = asyncio.get_running_loop()
+            batch = self._pending_batches[deployment_key] = {'inputs': [], 'future': loop.create_future()}
+            loop.call_later(PREDICT_BATCH_WINDOW, self._start_batch_flush, deployment_key, model_id, environment)
+        
+        index = len(batch['inputs'])
+        batch['inputs'].append(input_data)
+        results = await asyncio.shield(batch['future'])
+        return results[index]
+    
+    def _start_batch_flush(self, deployment_key: str, model_id: str, environment: DeploymentEnvironment):
+        """Timer callback: run the pending batch for a deployment"""
+        task = asyncio.ensure_future(self._flush_batch(deployment_key, model_id, environment))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _flush_batch(self, deployment_key: str, model_id: str, environment: DeploymentEnvironment):
+        """Run one predict_batch for the pending inputs and resolve their waiters"""
+        batch = self._pending_batches.pop(deployment_key)
+        try:
+            batch['future'].set_result(await self.predict_batch(model_id, environment, batch['inputs']))
+        except Exception as e:
+            batch['future'].set_exception(e)
+    
+    def _log_prediction_metrics(self, model_id: str, prediction_id: str, inference_time: float, ts_ns: int):
         """Log prediction metrics"""
         if model_id not in self.model_metrics:
             self.model_metrics[model_id] = {
                 'total_predictions': 0,
                 'avg_inference_time': 0.0,
-                'prediction_history': []
+                # Ring buffer of recent predictions; history_head counts all writes
+                'prediction_history': np.empty(PREDICTION_HISTORY_SIZE, dtype=_PREDICTION_HISTORY_DTYPE),
+                'history_head': 0
             }
         
         metrics = self.model_metrics[model_id]
@@ -267,15 +515,34 @@ class MLModelManager:
             (current_avg * (total_predictions - 1) + inference_time) / total_predictions
         )
         
-        # Store recent predictions (last 1000)
-        metrics['prediction_history'].append({
-            'prediction_id': prediction_id,
-            'inference_time': inference_time,
-            'timestamp': datetime.utcnow().isoformat()
-        })
-        
-        if len(metrics['prediction_history']) > 1000:
-            metrics['prediction_history'] = metrics['prediction_history'][-1000:]
+        # Store recent predictions (last PREDICTION_HISTORY_SIZE), overwriting the oldest
+        head = metrics['history_head']
+        metrics['prediction_history'][head % PREDICTION_HISTORY_SIZE] = (prediction_id, ts_ns, inference_time)
+        metrics['history_head'] = head + 1
+    
+    def get_prediction_history(self, model_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Recent predictions for a model, oldest first"""
+        metrics = self.model_metrics.get(model_id)
+        if not metrics:
+            return []
+        
+        history, head = metrics['prediction_history'], metrics['history_head']
+        if head <= PREDICTION_HISTORY_SIZE:
+            entries = history[:head]
+        else:
+            split = head % PREDICTION_HISTORY_SIZE
+            entries = np.concatenate((history[split:], history[:split]))
+        if limit is not None:
+            entries = entries[-limit:] if limit > 0 else entries[:0]
+        
+        return [
+            {
+                'prediction_id': str(pid),
+                'inference_time': float(dt),
+                'timestamp': datetime.utcfromtimestamp(t_ns / 1e9)
+            }
+            for pid, t_ns, dt in entries.tolist()
+        ]
     
     async def get_model_performance(self, model_id: str) -> Dict[str, Any]:
         """Get model performance metrics"""
@@ -286,6 +553,12 @@ class MLModelManager:
             metadata = self.models_registry[model_id]
             metrics = self.model_metrics.get(model_id, {})
             
+            # Timestamps are stored as t_ns and only converted here
+            last_prediction_at = None
+            if metrics.get('history_head'):
+                last = metrics['prediction_history'][(metrics['history_head'] - 1) % PREDICTION_HISTORY_SIZE]
+                last_prediction_at = datetime.utcfromtimestamp(int(last['t_ns']) / 1e9)
+            
             return {
                 'model_id': model_id,
                 'model_name': metadata.name,
@@ -293,9 +566,11 @@ class MLModelManager:
                 'status': metadata.status.value,
                 'total_predictions': metrics.get('total_predictions', 0),
                 'avg_inference_time': metrics.get('avg_inference_time', 0.0),
+                'last_prediction_at': last_prediction_at,
                 'model_size_mb': metadata.model_size_mb,
-                'created_at': metadata.created_at.isoformat(),
-                'last_updated': metadata.updated_at.isoformat(),
+                'quantization': metadata.quantization,
+                'created_at': metadata.created_at,
+                'last_updated': metadata.updated_at,
                 'training_metrics': metadata.metrics
             }
             
@@ -303,25 +578,33 @@ class MLModelManager:
             logger.error(f"Performance metrics failed: {e}")
             return {'error': str(e)}
     
-    async def list_models(self, model_type: Optional[ModelType] = None) -> List[Dict[str, Any]]:
-        """List all registered models"""
-        models = []
-        
-        for model_id, metadata in self.models_registry.items():
-            if model_type is None or metadata.model_type == model_type:
-                model_info = {
-                    'model_id': model_id,
-                    'name': metadata.name,
-                    'version': metadata.version,
-                    'type': metadata.model_type.value,
-                    'status': metadata.status.value,
-                    'created_at': metadata.created_at.isoformat(),
-                    'size_mb': metadata.model_size_mb,
-                    'creator': metadata.creator
-                }
-                models.append(model_info)
-        
-        return sorted(models, key=lambda x: x['created_at'], reverse=True)
+    async def list_models(self, model_type: Optional[ModelType] = None,
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List registered models, newest first (optionally only the newest `limit`)"""
+        candidates = [
+            (model_id, metadata) for model_id, metadata in self.models_registry.items()
+            if model_type is None or metadata.model_type == model_type
+        ]
+        
+        if limit is None:
+            selected = sorted(candidates, key=lambda item: item[1].created_at, reverse=True)
+        else:
+            selected = heapq.nlargest(limit, candidates, key=lambda item: item[1].created_at)
+        
+        return [self._model_info(model_id, metadata) for model_id, metadata in selected]
+    
+    def _model_info(self, model_id: str, metadata: ModelMetadata) -> Dict[str, Any]:
+        """Summary dict for list_models"""
+        return {
+            'model_id': model_id,
+            'name': metadata.name,
+            'version': metadata.version,
+            'type': metadata.model_type.value,
+            'status': metadata.status.value,
+            'created_at': metadata.created_at,
+            'size_mb': metadata.model_size_mb,
+            'creator': metadata.creator
+        }
 
 class ExperimentTracker:
     """Track ML experiments and hyperparameter tuning"""
@@ -393,8 +676,8 @@ class ExperimentTracker:
             'parameters': experiment.parameters,
             'metrics': experiment.metrics,
             'status': experiment.status,
-            'start_time': experiment.start_time.isoformat(),
-            'end_time': experiment.end_time.isoformat() if experiment.end_time else None,
+            'start_time': experiment.start_time,
+            'end_time': experiment.end_time,
             'duration_seconds': duration,
             'logs': experiment.logs[-10:]  # Last 10 log entries
         }
@@ -407,48 +690,83 @@ class ExperimentTracker:
             'best_experiment': None
         }
         
-        all_metrics = set()
-        best_score = float('-inf')
-        best_experiment_id = None
-        
-        for exp_id in experiment_ids:
-            if exp_id in self.experiments:
-                exp = self.experiments[exp_id]
-                exp_data = {
-                    'experiment_id': exp_id,
-                    'name': exp.name,
-                    'parameters': exp.parameters,
-                    'metrics': exp.metrics,
-                    'status': exp.status
-                }
-                comparison['experiments'].append(exp_data)
-                all_metrics.update(exp.metrics.keys())
-                
-                # Find best experiment (highest accuracy or lowest loss)
-                score = exp.metrics.get('accuracy', exp.metrics.get('f1_score', 0))
-                if score > best_score:
-                    best_score = score
-                    best_experiment_id = exp_id
-        
-        # Create metrics comparison
-        for metric in all_metrics:
-            comparison['metrics_comparison'][metric] = []
-            for exp in comparison['experiments']:
-                comparison['metrics_comparison'][metric].append({
-                    'experiment_id': exp['experiment_id'],
-                    'value': exp['metrics'].get(metric, None)
-                })
+        found_ids = [exp_id for exp_id in experiment_ids if exp_id in self.experiments]
+        if not found_ids:
+            return comparison
+        
+        for exp_id in found_ids:
+            exp = self.experiments[exp_id]
+            comparison['experiments'].append({
+                'experiment_id': exp_id,
+                'name': exp.name,
+                'parameters': exp.parameters,
+                'metrics': exp.metrics,
+                'status': exp.status
+            })
+        
+        # One experiments x metrics frame; missing metrics become None
+        df = pd.DataFrame([self.experiments[exp_id].metrics for exp_id in found_ids], index=found_ids)
+        values = df.astype(object).where(df.notna(), None)
+        comparison['metrics_comparison'] = {
+            metric: [{'experiment_id': exp_id, 'value': value} for exp_id, value in zip(found_ids, values[metric].tolist())]
+            for metric in values.columns
+        }
+        
+        # Find best experiment (highest accuracy, falling back to f1_score)
+        nan_scores = pd.Series(np.nan, index=df.index)
+        scores = df.get('accuracy', nan_scores).fillna(df.get('f1_score', nan_scores)).fillna(0)
         
-        comparison['best_experiment'] = best_experiment_id
+        # No experiment with a positive score means there is no best one
+        if scores.max() > 0:
+            comparison['best_experiment'] = scores.idxmax()
         
         return comparison
 
+DRIFT_WINDOW_SIZE = 1000
+
+def _welford_window_update(buf, head, count, mean, m2, values):
+    """Push values into the ring buffer, updating running (count, mean, M2) in O(len(values))"""
+    size = buf.shape[0]
+    for x in values:
+        if count == size:
+            # Window full: remove the value about to be overwritten (reverse Welford)
+            old = buf[head]
+            count -= 1
+            if count == 0:
+                mean = 0.0
+                m2 = 0.0
+            else:
+                delta = old - mean
+                mean -= delta / count
+                m2 -= delta * (old - mean)
+        buf[head] = x
+        head = (head + 1) % size
+        count += 1
+        delta = x - mean
+        mean += delta / count
+        m2 += delta * (x - mean)
+        if head == 0 and count == size:
+            # Re-anchor from the buffer once per lap, so rounding error from the
+            # reverse updates can't accumulate (amortized O(1) per value)
+            mean = 0.0
+            for i in range(size):
+                mean += buf[i]
+            mean /= size
+            m2 = 0.0
+            for i in range(size):
+                m2 += (buf[i] - mean) ** 2
+    return head, count, mean, m2
+
+if HAVE_NUMBA:
+    _welford_window_update = njit(cache=True)(_welford_window_update)
+
 class ModelMonitor:
     """Monitor deployed models for performance drift"""
     
     def __init__(self):
         self.monitoring_data = {}
         self.alerts = []
+        self.alerts_by_model: Dict[str, deque] = {}  # last 5 alerts per model
     
     async def monitor_model_drift(self, 
                                  model_id: str, 
@@ -458,50 +776,55 @@ class ModelMonitor:
         if model_id not in self.monitoring_data:
             self.monitoring_data[model_id] = {
                 'baseline_stats': None,
-                'recent_predictions': [],
+                # Ring buffer of the last DRIFT_WINDOW_SIZE predictions
+                'recent_predictions': np.empty(DRIFT_WINDOW_SIZE, dtype=np.float64),
+                'head': 0,
+                'count': 0,
+                # Running Welford state over the window
+                'mean': 0.0,
+                'M2': 0.0,
                 'performance_history': []
             }
         
         monitoring = self.monitoring_data[model_id]
-        monitoring['recent_predictions'].extend(predictions)
-        
-        # Keep only recent predictions (last 1000)
-        if len(monitoring['recent_predictions']) > 1000:
-            monitoring['recent_predictions'] = monitoring['recent_predictions'][-1000:]
+        values = np.asarray(predictions, dtype=np.float64)
+        head, count, mean, m2 = _welford_window_update(
+            monitoring['recent_predictions'], monitoring['head'], monitoring['count'],
+            monitoring['mean'], monitoring['M2'], values
+        )
+        monitoring.update(head=int(head), count=int(count), mean=float(mean), M2=float(m2))
         
         # Calculate drift metrics
-        drift_metrics = self._calculate_drift_metrics(model_id, predictions)
+        drift_metrics = self._calculate_drift_metrics(model_id)
         
         # Check for alerts
         await self._check_drift_alerts(model_id, drift_metrics)
         
         return drift_metrics
     
-    def _calculate_drift_metrics(self, model_id: str, predictions: List[float]) -> Dict[str, Any]:
+    def _calculate_drift_metrics(self, model_id: str) -> Dict[str, Any]:
         """Calculate drift metrics"""
         monitoring = self.monitoring_data[model_id]
         
-        if not monitoring['recent_predictions']:
+        if not monitoring['count']:
             return {'status': 'insufficient_data'}
         
-        recent_predictions = monitoring['recent_predictions']
-        
-        # Calculate statistics
-        mean_pred = np.mean(recent_predictions)
-        std_pred = np.std(recent_predictions)
+        # Statistics come from the running Welford state (population std, as np.std)
+        baseline = monitoring['baseline_stats']
+        mean_pred = monitoring['mean']
+        std_pred = float(np.sqrt(max(monitoring['M2'], 0.0) / monitoring['count']))
         
         # Set baseline if not exists
-        if monitoring['baseline_stats'] is None:
+        if baseline is None:
             monitoring['baseline_stats'] = {
                 'mean': mean_pred,
                 'std': std_pred,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': datetime.utcnow()
             }
             return {'status': 'baseline_set', 'baseline_mean': mean_pred, 'baseline_std': std_pred}
         
         # Compare with baseline
-        baseline = monitoring['baseline_stats']
-        mean_drift = abs(mean_pred - baseline['mean']) / baseline['mean'] * 100
+        mean_drift = abs(mean_pred - baseline['mean']) / baseline['mean'] * 100 if baseline['mean'] != 0 else float('inf')
         std_drift = abs(std_pred - baseline['std']) / baseline['std'] * 100 if baseline['std'] > 0 else 0
         
         drift_status = 'normal'
@@ -530,10 +853,11 @@ class ModelMonitor:
                 'severity': 'high',
                 'message': f"Significant drift detected in model {model_id}",
                 'metrics': drift_metrics,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': datetime.utcnow()
             }
             
             self.alerts.append(alert)
+            self.alerts_by_model.setdefault(model_id, deque(maxlen=5)).append(alert)
             logger.warning(f"🚨 Model drift alert: {alert['message']}")
     
     async def get_monitoring_status(self, model_id: str) -> Dict[str, Any]:
@@ -542,13 +866,13 @@ class ModelMonitor:
             return {'status': 'not_monitored'}
         
         monitoring = self.monitoring_data[model_id]
-        recent_alerts = [alert for alert in self.alerts if alert['model_id'] == model_id][-5:]
+        recent_alerts = list(self.alerts_by_model.get(model_id, ()))
         
         return {
             'model_id': model_id,
             'monitoring_active': True,
             'baseline_set': monitoring['baseline_stats'] is not None,
-            'total_predictions_monitored': len(monitoring['recent_predictions']),
+            'total_predictions_monitored': monitoring['count'],
             'recent_alerts': recent_alerts,
             'baseline_stats': monitoring['baseline_stats']
         }
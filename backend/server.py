@@ -1,10 +1,11 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Query, Request, Response
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Query, Request, Response, BackgroundTasks
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import WriteConcern, monitoring
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 from jose import JWTError, jwt
@@ -16,6 +17,8 @@ from pathlib import Path
 from dotenv import load_dotenv
 import openai
 import json
+import re
+import tempfile
 from enum import Enum
 import bcrypt
 import redis
@@ -25,6 +28,15 @@ import structlog
 import prometheus_client
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 from contextlib import asynccontextmanager
+from functools import lru_cache, wraps
+
+# Prefer uvloop when available; set the policy before any client or queue touches the
+# event loop (uvicorn's default --loop auto also picks uvloop when it is installed)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 # Import adaptive engine
 import sys
@@ -38,11 +50,11 @@ from adaptive_engine import (
 # Import advanced AI engine for Phase 1
 from ai_engine import (
     AdvancedAIEngine, EmotionalState, LearningStyle, AIPersonality,
-    advanced_ai_engine
+    advanced_ai_engine, load_chat_encoding
 )
 
 # Phase 2.1: Advanced Infrastructure Components
-from cache_manager import cache_manager, performance_monitor as cache_performance_monitor
+from cache_manager import cache_manager, ttl_cache, performance_monitor as cache_performance_monitor
 from security_manager import (
     create_security_middleware, password_hasher, encryption_manager,
     DataSanitizer, AdvancedRateLimiter, SecureTokenManager
@@ -56,6 +68,7 @@ from data_governance import (
 
 # Phase 2.2: Technical Infrastructure Components
 from cdn_manager import initialize_cdn_manager, CDNConfiguration, content_optimizer
+from http_clients import close_http_clients, openai_chat as _chat  # shared pooled client with retries
 from analytics_manager import (
     initialize_analytics_manager, AnalyticsConfiguration, AnalyticsEventBuilder
 )
@@ -91,11 +104,85 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 structured_logger = structlog.get_logger()
 
+# MongoDB connection pool sizing; the workload is IO-bound, so keep a warm floor and a hard cap
+MONGO_POOL_CONFIG = {
+    "maxPoolSize": int(os.environ.get('MONGO_MAX_POOL_SIZE', 50)),
+    "minPoolSize": int(os.environ.get('MONGO_MIN_POOL_SIZE', 10)),
+    "maxIdleTimeMS": 300000,
+    "waitQueueTimeoutMS": 2000,
+    "retryWrites": True
+}
+
+class MongoPoolStats(monitoring.ConnectionPoolListener):
+    """Track connection pool usage so saturation shows up in the performance metrics"""
+    
+    def __init__(self):
+        self.open_connections = 0
+        self.checked_out = 0
+        self.checkout_failures = 0
+    
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "max_pool_size": MONGO_POOL_CONFIG["maxPoolSize"],
+            "min_pool_size": MONGO_POOL_CONFIG["minPoolSize"],
+            "open_connections": self.open_connections,
+            "checked_out": self.checked_out,
+            "available": self.open_connections - self.checked_out,
+            "checkout_failures": self.checkout_failures
+        }
+    
+    def connection_created(self, event):
+        self.open_connections += 1
+    
+    def connection_closed(self, event):
+        self.open_connections -= 1
+    
+    def connection_checked_out(self, event):
+        self.checked_out += 1
+    
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+    
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_check_out_started(self, event):
+        pass
+
+mongo_pool_stats = MongoPoolStats()
+
 # Initialize clients
-client = AsyncIOMotorClient(MONGO_URL)
+client = AsyncIOMotorClient(MONGO_URL, event_listeners=[mongo_pool_stats], **MONGO_POOL_CONFIG)
 db = client[DB_NAME]
 openai.api_key = OPENAI_API_KEY
 
+# Response timestamps only need ~1s resolution; a background ticker keeps one pre-formatted
+TIMESTAMP_TICK_SECONDS = 0.5
+_NOW_ISO = datetime.now(timezone.utc).isoformat()
+timestamp_ticker_task: Optional[asyncio.Task] = None
+
+async def _tick_timestamp():
+    """Refresh the cached ISO timestamp used in response bodies"""
+    global _NOW_ISO
+    while True:
+        _NOW_ISO = datetime.now(timezone.utc).isoformat()
+        await asyncio.sleep(TIMESTAMP_TICK_SECONDS)
+
 # ============================================================================
 # PHASE 1: CRITICAL INFRASTRUCTURE - REDIS & MONITORING SETUP
 # ============================================================================
@@ -252,7 +339,11 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 # FastAPI app setup
-app = FastAPI(title="StarGuide API", description="IDFS PathwayIQ™ Educational Platform")
+app = FastAPI(
+    title="StarGuide API",
+    description="IDFS PathwayIQ™ Educational Platform",
+    default_response_class=ORJSONResponse
+)
 api_router = APIRouter(prefix="/api")
 
 # CORS Configuration - Multi-domain support for StarGuide deployment
@@ -321,7 +412,7 @@ async def monitoring_and_rate_limiting_middleware(request: Request, call_next):
             current_count=current_count,
             limit=effective_limit
         )
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=429,
             content={
                 "error": "Rate limit exceeded",
@@ -367,7 +458,7 @@ async def monitoring_and_rate_limiting_middleware(request: Request, call_next):
             error=str(e)
         )
         status_code = 500
-        response = JSONResponse(
+        response = ORJSONResponse(
             status_code=500,
             content={"error": "Internal server error"}
         )
@@ -769,7 +860,7 @@ async def get_ai_response(messages: List[Dict[str, str]], user_context: Optional
         if user_context:
             system_prompt += f"\nStudent context: Level {user_context.get('level', 1)}, XP: {user_context.get('xp', 0)}"
         
-        response = openai.chat.completions.create(
+        response = await _chat(
             model="gpt-4",
             messages=[{"role": "system", "content": system_prompt}] + messages,
             max_tokens=500,
@@ -1242,7 +1333,7 @@ async def create_study_group(group_data: StudyGroupCreate, current_user: User =
         # AI-powered group features
         try:
             # Generate AI-powered study recommendations for the group
-            study_recommendations = await openai.chat.completions.create(
+            study_recommendations = await _chat(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are an AI study coordinator. Generate personalized study recommendations for study groups."},
@@ -1301,7 +1392,7 @@ async def join_study_group(group_id: str, current_user: User = Depends(get_curre
         
         # AI-powered welcome message
         try:
-            welcome_response = await openai.chat.completions.create(
+            welcome_response = await _chat(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are a friendly AI study group coordinator. Welcome new members warmly."},
@@ -1353,7 +1444,7 @@ async def create_quiz_room(room_data: QuizRoomCreate, current_user: User = Depen
         # AI-powered quiz features
         try:
             # Generate AI-powered quiz questions
-            quiz_questions_response = await openai.chat.completions.create(
+            quiz_questions_response = await _chat(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are an AI quiz generator. Create engaging, educational quiz questions with multiple choice answers."},
@@ -1416,7 +1507,7 @@ async def join_quiz_room(room_id: str, current_user: User = Depends(get_current_
             user_answers = await db.user_answers.find({"user_id": current_user.id}).to_list(50)
             avg_score = sum(answer.get("points_earned", 0) for answer in user_answers) / max(len(user_answers), 1)
             
-            matchmaking_response = await openai.chat.completions.create(
+            matchmaking_response = await _chat(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are an AI quiz coordinator. Provide motivational pre-game analysis."},
@@ -1477,6 +1568,10 @@ async def join_quiz_room(room_code: str, current_user: User = Depends(get_curren
 # AI TUTOR ENDPOINTS
 # ============================================================================
 
+# Stored conversation history is capped; only the tail is sent to the model
+AI_CONVERSATION_MAX_MESSAGES = 40
+AI_CONTEXT_MESSAGES = 20
+
 @api_router.post("/ai/chat")
 async def chat_with_ai(
     message: str,
@@ -1486,23 +1581,17 @@ async def chat_with_ai(
     if not session_id:
         session_id = str(uuid.uuid4())
     
-    # Get or create conversation
-    conversation = await db.ai_conversations.find_one({
-        "user_id": current_user.id,
-        "session_id": session_id
-    })
+    conversation_filter = {"user_id": current_user.id, "session_id": session_id}
     
-    if not conversation:
-        conversation = AIConversation(
-            user_id=current_user.id,
-            session_id=session_id,
-            messages=[]
-        )
-    else:
-        conversation = AIConversation(**conversation)
+    # Load only the most recent messages as context
+    conversation = await db.ai_conversations.find_one(
+        conversation_filter,
+        projection={"_id": 0, "messages": {"$slice": -AI_CONTEXT_MESSAGES}}
+    )
+    history = conversation.get("messages", []) if conversation else []
     
     # Add user message
-    conversation.messages.append({"role": "user", "content": message})
+    user_message = {"role": "user", "content": message}
     
     # Get AI response
     user_context = {
@@ -1511,14 +1600,22 @@ async def chat_with_ai(
         "role": current_user.role
     }
     
-    ai_response = await get_ai_response(conversation.messages, user_context)
-    conversation.messages.append({"role": "assistant", "content": ai_response})
-    conversation.updated_at = datetime.now(timezone.utc)
-    
-    # Save conversation
-    await db.ai_conversations.replace_one(
-        {"user_id": current_user.id, "session_id": session_id},
-        conversation.dict(),
+    ai_response = await get_ai_response(history + [user_message], user_context)
+    now = datetime.now(timezone.utc)
+    
+    # Append the new turn and trim stored history in a single update
+    await db.ai_conversations.update_one(
+        conversation_filter,
+        {
+            "$push": {
+                "messages": {
+                    "$each": [user_message, {"role": "assistant", "content": ai_response}],
+                    "$slice": -AI_CONVERSATION_MAX_MESSAGES
+                }
+            },
+            "$set": {"updated_at": now},
+            "$setOnInsert": {"id": str(uuid.uuid4()), "created_at": now}
+        },
         upsert=True
     )
     
@@ -1620,7 +1717,7 @@ async def generate_comprehensive_questions(
     
     # Generate Math Questions
     try:
-        math_response = await openai.chat.completions.create(
+        math_response = await _chat(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": f"You are an expert math educator creating {grade_level} assessment questions. Create challenging, grade-appropriate questions that test deep understanding."},
@@ -1630,44 +1727,38 @@ async def generate_comprehensive_questions(
             temperature=0.7
         )
         
-        # Simple JSON parsing fallback
-        math_questions_data = [
-            {
-                "id": str(uuid.uuid4()),
-                "question_text": f"Advanced {grade_level} Mathematics Problem",
-                "question_type": "mcq", 
-                "options": ["Option A", "Option B", "Option C", "Option D"],
-                "correct_answer": "Option A",
-                "explanation": "Mathematical reasoning explanation",
-                "difficulty_level": "medium",
-                "subject": "mathematics",
-                "grade_level": grade_level,
-                "estimated_time": 4
-            } for _ in range(math_questions)
-        ]
-        questions.extend(math_questions_data)
+        # Simple JSON parsing fallback: build the template once, vary only the id
+        math_template = {
+            "question_text": f"Advanced {grade_level} Mathematics Problem",
+            "question_type": "mcq", 
+            "options": ["Option A", "Option B", "Option C", "Option D"],
+            "correct_answer": "Option A",
+            "explanation": "Mathematical reasoning explanation",
+            "difficulty_level": "medium",
+            "subject": "mathematics",
+            "grade_level": grade_level,
+            "estimated_time": 4
+        }
+        questions.extend({**math_template, "id": str(uuid.uuid4())} for _ in range(math_questions))
         
     except Exception as e:
         logger.error(f"Math question generation failed: {e}")
     
     # Generate Science Questions  
     try:
-        science_questions_data = [
-            {
-                "id": str(uuid.uuid4()),
-                "question_text": f"Advanced {grade_level} Science Problem",
-                "question_type": "mcq",
-                "options": ["Scientific Option A", "Scientific Option B", "Scientific Option C", "Scientific Option D"],
-                "correct_answer": "Scientific Option A", 
-                "explanation": "Scientific reasoning explanation",
-                "difficulty_level": "medium",
-                "subject": "science",
-                "grade_level": grade_level,
-                "real_world_context": "Real-world scientific application",
-                "estimated_time": 4
-            } for _ in range(science_questions)
-        ]
-        questions.extend(science_questions_data)
+        science_template = {
+            "question_text": f"Advanced {grade_level} Science Problem",
+            "question_type": "mcq",
+            "options": ["Scientific Option A", "Scientific Option B", "Scientific Option C", "Scientific Option D"],
+            "correct_answer": "Scientific Option A", 
+            "explanation": "Scientific reasoning explanation",
+            "difficulty_level": "medium",
+            "subject": "science",
+            "grade_level": grade_level,
+            "real_world_context": "Real-world scientific application",
+            "estimated_time": 4
+        }
+        questions.extend({**science_template, "id": str(uuid.uuid4())} for _ in range(science_questions))
         
     except Exception as e:
         logger.error(f"Science question generation failed: {e}")
@@ -1675,22 +1766,19 @@ async def generate_comprehensive_questions(
     # Generate Logic & AI Ethics Questions
     if include_ai_ethics:
         try:
-            ai_questions_data = [
-                {
-                    "id": str(uuid.uuid4()),
-                    "question_text": f"AI Ethics and Logic for {grade_level}",
-                    "question_type": "scenario_based",
-                    "options": ["Ethical Choice A", "Ethical Choice B", "Ethical Choice C", "Ethical Choice D"],
-                    "correct_answer": "Ethical Choice A",
-                    "explanation": "AI ethics reasoning explanation", 
-                    "difficulty_level": "medium",
-                    "subject": "ai_ethics",
-                    "grade_level": grade_level,
-                    "ai_ethics_component": "Understanding AI impact on society",
-                    "estimated_time": 5
-                } for _ in range(logic_ai_questions)
-            ]
-            questions.extend(ai_questions_data)
+            ai_template = {
+                "question_text": f"AI Ethics and Logic for {grade_level}",
+                "question_type": "scenario_based",
+                "options": ["Ethical Choice A", "Ethical Choice B", "Ethical Choice C", "Ethical Choice D"],
+                "correct_answer": "Ethical Choice A",
+                "explanation": "AI ethics reasoning explanation", 
+                "difficulty_level": "medium",
+                "subject": "ai_ethics",
+                "grade_level": grade_level,
+                "ai_ethics_component": "Understanding AI impact on society",
+                "estimated_time": 5
+            }
+            questions.extend({**ai_template, "id": str(uuid.uuid4())} for _ in range(logic_ai_questions))
             
         except Exception as e:
             logger.error(f"AI ethics question generation failed: {e}")
@@ -1808,7 +1896,7 @@ async def submit_comprehensive_answer(
         
         if think_aloud_response:
             try:
-                reasoning_analysis = await openai.chat.completions.create(
+                reasoning_analysis = await _chat(
                     model="gpt-4",
                     messages=[
                         {"role": "system", "content": "You are an expert educator analyzing student reasoning. Rate the quality of thinking from 0-1 and provide feedback."},
@@ -1893,11 +1981,18 @@ async def submit_comprehensive_answer(
 
 @api_router.get("/analytics/dashboard")
 async def get_dashboard_analytics(current_user: User = Depends(get_current_user)):
-    # Get user answers
-    answers = await db.user_answers.find({"user_id": current_user.id}).to_list(1000)
-    
-    total_questions = len(answers)
-    correct_answers = sum(1 for a in answers if a.get("is_correct", False))
+    # Get answer totals server-side instead of pulling every answer
+    answer_stats = await db.user_answers.aggregate([
+        {"$match": {"user_id": current_user.id}},
+        {"$group": {
+            "_id": None,
+            "total": {"$sum": 1},
+            "correct": {"$sum": {"$cond": [{"$eq": ["$is_correct", True]}, 1, 0]}}
+        }}
+    ]).to_list(1)
+    
+    total_questions = answer_stats[0]["total"] if answer_stats else 0
+    correct_answers = answer_stats[0]["correct"] if answer_stats else 0
     accuracy = (correct_answers / total_questions * 100) if total_questions > 0 else 0
     
     # Get study sessions
@@ -1907,14 +2002,12 @@ async def get_dashboard_analytics(current_user: User = Depends(get_current_user)
     # Get study groups
     groups = await db.study_groups.find({"members": current_user.id}).to_list(100)
     
-    # Convert MongoDB documents to dictionaries and handle ObjectId
-    recent_activity = []
-    if answers:
-        for answer in answers[-10:]:
-            # Convert ObjectId to string if present
-            if "_id" in answer:
-                answer["_id"] = str(answer["_id"])
-            recent_activity.append(answer)
+    # Fetch only the last 10 answers, excluding ObjectId so no conversion is needed
+    recent_activity = await db.user_answers.find(
+        {"user_id": current_user.id},
+        projection={"_id": 0}
+    ).sort("_id", -1).limit(10).to_list(10)
+    recent_activity.reverse()
     
     return {
         "user_stats": {
@@ -1941,8 +2034,12 @@ async def get_chat_messages(
     limit: int = 50,
     current_user: User = Depends(get_current_user)
 ):
-    messages = await db.chat_messages.find({"room_id": room_id}).sort("timestamp", -1).limit(limit).to_list(limit)
-    return [ChatMessage(**m) for m in messages]
+    # Plain dicts (no _id) go straight to orjson without per-message model validation
+    messages = await db.chat_messages.find(
+        {"room_id": room_id},
+        projection={"_id": 0}
+    ).sort("timestamp", -1).limit(limit).to_list(limit)
+    return messages
 
 @api_router.post("/chat/{room_id}/message")
 async def send_chat_message(
@@ -1973,7 +2070,7 @@ async def comprehensive_health_check():
     """Advanced health check with all system components"""
     health_status = {
         "status": "healthy",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": _NOW_ISO,
         "version": "2.0.0",
         "services": {}
     }
@@ -2014,11 +2111,25 @@ async def comprehensive_health_check():
     
     return health_status
 
+class _SingleMetricCollector:
+    """Wraps one collected metric family so generate_latest renders it on its own"""
+    
+    def __init__(self, metric):
+        self.metric = metric
+    
+    def collect(self):
+        return [self.metric]
+
+def _iter_prometheus_exposition(registry):
+    """Yield the exposition text one metric family at a time"""
+    for metric in registry.collect():
+        yield generate_latest(_SingleMetricCollector(metric))
+
 @api_router.get("/metrics")
 async def prometheus_metrics():
     """Prometheus metrics endpoint"""
-    return Response(
-        generate_latest(prometheus_client.REGISTRY),
+    return StreamingResponse(
+        _iter_prometheus_exposition(prometheus_client.REGISTRY),
         media_type=CONTENT_TYPE_LATEST
     )
 
@@ -2055,7 +2166,7 @@ async def system_statistics(current_user: dict = Depends(get_current_user)):
                 "total": await db.users.count_documents({})
             },
             "rate_limiting": rate_limit_stats,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _NOW_ISO
         }
         
     except Exception as e:
@@ -2065,11 +2176,107 @@ async def system_statistics(current_user: dict = Depends(get_current_user)):
 # Include router in main app - MOVED TO END OF FILE
 # app.include_router(api_router)
 
+async def ensure_indexes():
+    """Create the compound indexes behind the per-user, time-ordered queries"""
+    await asyncio.gather(
+        db.voice_interactions.create_index([("user_id", 1), ("timestamp", -1)]),
+        db.enhanced_ai_conversations.create_index([("user_id", 1), ("timestamp", -1)]),
+        db.user_answers.create_index([("user_id", 1), ("answered_at", -1)]),
+        db.learning_paths.create_index([("user_id", 1), ("created_at", -1)]),
+        db.learning_style_assessments.create_index([("user_id", 1), ("assessment_date", -1)]),
+        db.ai_conversations.create_index([("user_id", 1), ("session_id", 1)])
+    )
+
+# Background writer for audit-style inserts the client does not wait on
+AUDIT_WRITE_QUEUE_SIZE = 10_000
+AUDIT_WRITE_BATCH_SIZE = 200
+AUDIT_WRITE_FLUSH_INTERVAL = 0.05
+AUDIT_WRITE_DRAIN_TIMEOUT = 5.0
+# Audit logs are not critical: acknowledge on the primary without waiting for the journal
+AUDIT_WRITE_CONCERN = WriteConcern(w=1, j=False)
+
+audit_write_queue: asyncio.Queue = asyncio.Queue(maxsize=AUDIT_WRITE_QUEUE_SIZE)
+audit_writer_task: Optional[asyncio.Task] = None
+
+def queue_audit_write(collection: str, document: dict, background_tasks: BackgroundTasks):
+    """Hand a document to the background writer, or to a per-request task if the queue is full"""
+    try:
+        audit_write_queue.put_nowait((collection, document))
+    except asyncio.QueueFull:
+        background_tasks.add_task(db[collection].insert_one, document)
+
+async def _flush_audit_batches(batches: Dict[str, List[dict]]):
+    """Write each collection's batch with a single unordered insert_many"""
+    for collection, documents in batches.items():
+        try:
+            await db[collection].with_options(write_concern=AUDIT_WRITE_CONCERN).insert_many(
+                documents, ordered=False
+            )
+        except Exception as e:
+            logger.error(f"Audit write to {collection} failed: {e}")
+
+async def _audit_writer_loop():
+    """Flush queued writes every AUDIT_WRITE_FLUSH_INTERVAL or once a batch is full"""
+    loop = asyncio.get_running_loop()
+    while True:
+        collection, document = await audit_write_queue.get()
+        batches = defaultdict(list)
+        batches[collection].append(document)
+        count = 1
+        deadline = loop.time() + AUDIT_WRITE_FLUSH_INTERVAL
+        while count < AUDIT_WRITE_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                collection, document = await asyncio.wait_for(audit_write_queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            batches[collection].append(document)
+            count += 1
+        
+        await _flush_audit_batches(batches)
+        for _ in range(count):
+            audit_write_queue.task_done()
+
+async def stop_audit_writer():
+    """Let queued writes drain, then stop the writer task"""
+    if audit_writer_task is None:
+        return
+    try:
+        await asyncio.wait_for(audit_write_queue.join(), timeout=AUDIT_WRITE_DRAIN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"Audit writer stopped with {audit_write_queue.qsize()} writes pending")
+    audit_writer_task.cancel()
+    try:
+        await audit_writer_task
+    except asyncio.CancelledError:
+        pass
+
+# Optional Phase 2.2 managers; the flags are resolved once during startup
+cdn_manager = None
+analytics_manager = None
+HAVE_CDN = False
+HAVE_ANALYTICS = False
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     logger.info("🚀 PathwayIQ API starting up with Phase 2.1 enhancements...")
     
+    try:
+        await ensure_indexes()
+        logger.info("✅ Database indexes ensured")
+    except Exception as e:
+        logger.error(f"❌ Failed to create database indexes: {e}")
+    
+    global audit_writer_task, timestamp_ticker_task
+    audit_writer_task = asyncio.create_task(_audit_writer_loop())
+    timestamp_ticker_task = asyncio.create_task(_tick_timestamp())
+    
+    # Token counting for the tutor's OpenAI rate limiter; falls back to a length estimate
+    await load_chat_encoding()
+    
     # Phase 2.1: Initialize advanced infrastructure components
     try:
         # Initialize Redis cache manager
@@ -2108,9 +2315,10 @@ async def startup_event():
             domain=os.environ.get('DOMAIN_NAME', 'localhost')
         )
         if cdn_config.zone_id and cdn_config.api_token:
-            global cdn_manager
+            global cdn_manager, HAVE_CDN
             cdn_manager = initialize_cdn_manager(cdn_config)
             await cdn_manager.initialize()
+            HAVE_CDN = True
             logger.info("✅ CDN Manager initialized")
         
         # Initialize analytics manager
@@ -2119,9 +2327,10 @@ async def startup_event():
             google_analytics_id=os.environ.get('GA_TRACKING_ID'),
             enable_internal_analytics=True
         )
-        global analytics_manager
+        global analytics_manager, HAVE_ANALYTICS
         analytics_manager = initialize_analytics_manager(analytics_config)
         await analytics_manager.initialize()
+        HAVE_ANALYTICS = True
         logger.info("✅ Analytics Manager initialized")
         
         # MLOps components are already initialized as globals
@@ -2165,15 +2374,81 @@ async def startup_event():
 # PHASE 2.1: ADVANCED INFRASTRUCTURE ENDPOINTS
 # ============================================================================
 
+async def _collect(func, *args, **kwargs):
+    """Await an async collector, or call a synchronous one inline"""
+    if asyncio.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    return func(*args, **kwargs)
+
+def _in_thread(func):
+    """Wrap a blocking (psutil-sampling) collector so it runs in a worker thread.
+    
+    Only for collectors that read no shared in-memory state: the event loop
+    keeps mutating the monitors' dicts while the thread runs.
+    """
+    @wraps(func)
+    async def run(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return run
+
+class CompositeMetricsCollector:
+    """Single front for all monitor objects behind the /system/* endpoints.
+    
+    Stale sections are refreshed concurrently under one lock, and every
+    section is served from its last snapshot for ``ttl_seconds`` so
+    concurrent requests share one round of collection. This is the only
+    cache for these endpoints; don't stack ``ttl_cache`` on top of it.
+    """
+    
+    def __init__(self, collectors: Dict[str, Any], ttl_seconds: float = 1.0):
+        self.collectors = collectors
+        self.ttl_seconds = ttl_seconds
+        self._lock = asyncio.Lock()
+        self._snapshots: Dict[str, Any] = {}
+        self._collected_at: Dict[str, float] = {}
+    
+    def _stale_sections(self, sections) -> List[str]:
+        now = time.monotonic()
+        return [
+            name for name in sections
+            if now - self._collected_at.get(name, float("-inf")) >= self.ttl_seconds
+        ]
+    
+    async def collect(self, *sections: str) -> Dict[str, Any]:
+        """Return the requested sections (all by default), refreshing stale ones"""
+        sections = sections or tuple(self.collectors)
+        
+        if self._stale_sections(sections):
+            async with self._lock:
+                # Another request may have refreshed them while we waited
+                stale = self._stale_sections(sections)
+                if stale:
+                    results = await asyncio.gather(*(_collect(self.collectors[name]) for name in stale))
+                    now = time.monotonic()
+                    for name, result in zip(stale, results):
+                        self._snapshots[name] = result
+                        self._collected_at[name] = now
+        
+        return {name: self._snapshots[name] for name in sections}
+
+composite_collector = CompositeMetricsCollector({
+    "health_report": diagnostic_tools.run_health_check,
+    "performance": performance_monitor.get_performance_summary,
+    "profiler": application_profiler.get_performance_report,
+    "cache_stats": cache_manager.get_stats,
+    "cache_performance": cache_performance_monitor.get_performance_report,
+    "diagnostic_report": _in_thread(diagnostic_tools.generate_diagnostic_report)
+})
+
 @api_router.get("/system/health-advanced")
 async def advanced_health_check(current_user: dict = Depends(get_current_user)):
     """Advanced health check with detailed diagnostics"""
     try:
-        health_report = await diagnostic_tools.run_health_check()
+        metrics = await composite_collector.collect("health_report")
         return {
             "status": "success",
-            "health_report": health_report,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "health_report": metrics["health_report"],
+            "timestamp": _NOW_ISO
         }
     except Exception as e:
         logger.error(f"Advanced health check failed: {e}")
@@ -2183,16 +2458,15 @@ async def advanced_health_check(current_user: dict = Depends(get_current_user)):
 async def get_performance_metrics(current_user: dict = Depends(get_current_user)):
     """Get detailed performance metrics"""
     try:
-        performance_summary = performance_monitor.get_performance_summary()
-        profiler_report = application_profiler.get_performance_report()
-        cache_stats = cache_manager.get_stats()
+        metrics = await composite_collector.collect("performance", "profiler", "cache_stats")
         
         return {
             "status": "success",
-            "performance": performance_summary,
-            "profiler": profiler_report,
-            "cache": cache_stats,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "performance": metrics["performance"],
+            "profiler": metrics["profiler"],
+            "cache": metrics["cache_stats"],
+            "mongo_pool": mongo_pool_stats.snapshot(),
+            "timestamp": _NOW_ISO
         }
     except Exception as e:
         logger.error(f"Performance metrics failed: {e}")
@@ -2210,13 +2484,14 @@ async def get_security_status(current_user: dict = Depends(get_current_user)):
         return {
             "status": "success",
             "security_metrics": security_metrics,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _NOW_ISO
         }
     except Exception as e:
         logger.error(f"Security status check failed: {e}")
         raise HTTPException(status_code=500, detail=f"Security status failed: {str(e)}")
 
 @api_router.get("/system/data-governance")
+@ttl_cache(seconds=1.0)
 async def get_data_governance_status(current_user: dict = Depends(get_current_user)):
     """Get data governance framework status"""
     try:
@@ -2225,7 +2500,7 @@ async def get_data_governance_status(current_user: dict = Depends(get_current_us
         return {
             "status": "success",
             "governance": governance_status,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _NOW_ISO
         }
     except Exception as e:
         logger.error(f"Data governance status failed: {e}")
@@ -2235,14 +2510,13 @@ async def get_data_governance_status(current_user: dict = Depends(get_current_us
 async def get_cache_analytics(current_user: dict = Depends(get_current_user)):
     """Get cache performance analytics"""
     try:
-        cache_stats = cache_manager.get_stats()
-        performance_report = cache_performance_monitor.get_performance_report()
+        metrics = await composite_collector.collect("cache_stats", "cache_performance")
         
         return {
             "status": "success",
-            "cache_stats": cache_stats,
-            "performance": performance_report,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "cache_stats": metrics["cache_stats"],
+            "performance": metrics["cache_performance"],
+            "timestamp": _NOW_ISO
         }
     except Exception as e:
         logger.error(f"Cache analytics failed: {e}")
@@ -2252,12 +2526,12 @@ async def get_cache_analytics(current_user: dict = Depends(get_current_user)):
 async def generate_diagnostic_report(current_user: dict = Depends(get_current_user)):
     """Generate comprehensive diagnostic report"""
     try:
-        diagnostic_report = diagnostic_tools.generate_diagnostic_report()
+        metrics = await composite_collector.collect("diagnostic_report")
         
         return {
             "status": "success",
-            "diagnostic_report": diagnostic_report,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "diagnostic_report": metrics["diagnostic_report"],
+            "timestamp": _NOW_ISO
         }
     except Exception as e:
         logger.error(f"Diagnostic report failed: {e}")
@@ -2271,21 +2545,29 @@ async def generate_diagnostic_report(current_user: dict = Depends(get_current_us
 async def get_cdn_status(current_user: dict = Depends(get_current_user)):
     """Get CDN status and analytics"""
     try:
-        if 'cdn_manager' in globals() and cdn_manager:
-            cdn_status = cdn_manager.get_cdn_status()
-            analytics = await cdn_manager.get_analytics(days=7)
+        if HAVE_CDN:
+            cdn_status, analytics = await asyncio.gather(
+                _collect(cdn_manager.get_cdn_status),
+                _collect(cdn_manager.get_analytics, days=7),
+                return_exceptions=True
+            )
+            if isinstance(cdn_status, Exception):
+                raise cdn_status
+            # Analytics are best-effort: a Cloudflare failure is reported inline
+            if isinstance(analytics, Exception):
+                analytics = {"status": "error", "error": str(analytics)}
             
             return {
                 "status": "success",
                 "cdn_status": cdn_status,
                 "analytics": analytics,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": _NOW_ISO
             }
         else:
             return {
                 "status": "not_configured",
                 "message": "CDN not configured",
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": _NOW_ISO
             }
     except Exception as e:
         logger.error(f"CDN status failed: {e}")
@@ -2295,17 +2577,21 @@ async def get_cdn_status(current_user: dict = Depends(get_current_user)):
 async def purge_cdn_cache(
     purge_all: bool = False,
     urls: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
     current_user: dict = Depends(get_current_user)
 ):
     """Purge CDN cache"""
     try:
-        if 'cdn_manager' in globals() and cdn_manager:
-            result = await cdn_manager.purge_cache(urls=urls, purge_all=purge_all)
+        if HAVE_CDN:
+            if tags:
+                result = await cdn_manager.purge_by_tags(tags)
+            else:
+                result = await cdn_manager.purge_cache(urls=urls, purge_all=purge_all)
             
             return {
                 "status": "success",
                 "purge_result": result,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": _NOW_ISO
             }
         else:
             return {
@@ -2316,20 +2602,34 @@ async def purge_cdn_cache(
         logger.error(f"CDN purge failed: {e}")
         raise HTTPException(status_code=500, detail=f"CDN purge failed: {str(e)}")
 
+@api_router.get("/system/cdn-manifest")
+async def get_cdn_manifest(
+    assets: List[str] = Query(...),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get the cache manifest for a set of static assets"""
+    try:
+        # Served pre-serialized; identical asset sets reuse the cached bytes
+        return Response(content=content_optimizer.cache_manifest_bytes(assets), media_type="application/json")
+    except Exception as e:
+        logger.error(f"CDN manifest failed: {e}")
+        raise HTTPException(status_code=500, detail=f"CDN manifest failed: {str(e)}")
+
 @api_router.get("/analytics/platform")
+@ttl_cache(seconds=1.0)
 async def get_platform_analytics(
     days: int = 7,
     current_user: dict = Depends(get_current_user)
 ):
     """Get platform-wide analytics"""
     try:
-        if 'analytics_manager' in globals() and analytics_manager:
+        if HAVE_ANALYTICS:
             analytics = await analytics_manager.get_platform_analytics(days=days)
             
             return {
                 "status": "success",
                 "analytics": analytics,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": _NOW_ISO
             }
         else:
             return {
@@ -2348,13 +2648,13 @@ async def get_user_analytics(
 ):
     """Get analytics for specific user"""
     try:
-        if 'analytics_manager' in globals() and analytics_manager:
+        if HAVE_ANALYTICS:
             analytics = await analytics_manager.get_user_analytics(user_id, days=days)
             
             return {
                 "status": "success",
                 "analytics": analytics,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": _NOW_ISO
             }
         else:
             return {
@@ -2366,16 +2666,17 @@ async def get_user_analytics(
         raise HTTPException(status_code=500, detail=f"User analytics failed: {str(e)}")
 
 @api_router.get("/analytics/real-time")
+@ttl_cache(seconds=1.0)
 async def get_real_time_analytics(current_user: dict = Depends(get_current_user)):
     """Get real-time analytics metrics"""
     try:
-        if 'analytics_manager' in globals() and analytics_manager:
+        if HAVE_ANALYTICS:
             metrics = await analytics_manager.get_real_time_metrics()
             
             return {
                 "status": "success",
                 "metrics": metrics,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": _NOW_ISO
             }
         else:
             return {
@@ -2407,7 +2708,7 @@ async def list_ml_models(
         return {
             "status": "success",
             "models": models,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _NOW_ISO
         }
     except Exception as e:
         logger.error(f"List models failed: {e}")
@@ -2425,25 +2726,33 @@ async def get_model_performance(
         return {
             "status": "success",
             "performance": performance,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _NOW_ISO
         }
     except Exception as e:
         logger.error(f"Model performance failed: {e}")
         raise HTTPException(status_code=500, detail=f"Model performance failed: {str(e)}")
 
+EXPERIMENT_FETCH_CONCURRENCY = 16
+
 @api_router.get("/mlops/experiments")
 async def list_experiments(current_user: dict = Depends(get_current_user)):
     """List ML experiments"""
     try:
-        experiments = []
-        for exp_id in experiment_tracker.experiments.keys():
-            exp_result = await experiment_tracker.get_experiment_results(exp_id)
-            experiments.append(exp_result)
+        # Fetch results concurrently, bounded so large trackers don't flood downstream
+        semaphore = asyncio.Semaphore(EXPERIMENT_FETCH_CONCURRENCY)
+        
+        async def fetch(exp_id: str):
+            async with semaphore:
+                return await experiment_tracker.get_experiment_results(exp_id)
+        
+        experiments = await asyncio.gather(
+            *(fetch(exp_id) for exp_id in list(experiment_tracker.experiments.keys()))
+        )
         
         return {
             "status": "success",
             "experiments": experiments,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _NOW_ISO
         }
     except Exception as e:
         logger.error(f"List experiments failed: {e}")
@@ -2461,7 +2770,7 @@ async def get_model_monitoring(
         return {
             "status": "success",
             "monitoring": monitoring_status,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _NOW_ISO
         }
     except Exception as e:
         logger.error(f"Model monitoring failed: {e}")
@@ -2471,27 +2780,34 @@ async def get_model_monitoring(
 # PHASE 1: ADVANCED AI CAPABILITIES ENDPOINTS
 # ============================================================================
 
+VOICE_UPLOAD_CHUNK_SIZE = 64 * 1024
+VOICE_UPLOAD_SPOOL_SIZE = 1 << 20
+
 @api_router.post("/ai/voice-to-text")
 async def process_voice_input(
+    background_tasks: BackgroundTasks,
     audio_file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
     """Process voice input and convert to text with emotional analysis"""
     try:
-        # Read audio file
-        audio_data = await audio_file.read()
-        
-        # Process with advanced AI engine
-        result = await advanced_ai_engine.process_voice_input(audio_data, current_user.id)
+        # Stream the upload in chunks; small clips stay in memory, large ones spill to disk
+        with tempfile.SpooledTemporaryFile(max_size=VOICE_UPLOAD_SPOOL_SIZE) as audio_buffer:
+            while chunk := await audio_file.read(VOICE_UPLOAD_CHUNK_SIZE):
+                audio_buffer.write(chunk)
+            audio_buffer.seek(0)
+            
+            # Process with advanced AI engine
+            result = await advanced_ai_engine.process_voice_input(audio_buffer, current_user.id)
         
         # Store voice interaction for learning style analysis
-        await db.voice_interactions.insert_one({
+        queue_audit_write("voice_interactions", {
             "user_id": current_user.id,
             "transcribed_text": result.get("transcribed_text", ""),
             "emotional_state": result.get("emotional_state", "focused"),
             "learning_style": result.get("learning_style", "multimodal"),
             "timestamp": datetime.now(timezone.utc)
-        })
+        }, background_tasks)
         
         return result
         
@@ -2502,6 +2818,7 @@ async def process_voice_input(
 @api_router.post("/ai/enhanced-chat")
 async def enhanced_ai_chat(
     request: EnhancedChatRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """Enhanced AI chat with emotional intelligence and adaptive responses"""
@@ -2548,7 +2865,7 @@ async def enhanced_ai_chat(
             "timestamp": datetime.now(timezone.utc)
         }
         
-        await db.enhanced_ai_conversations.insert_one(conversation_data)
+        queue_audit_write("enhanced_ai_conversations", conversation_data, background_tasks)
         
         return {
             "session_id": request.session_id,
@@ -2564,6 +2881,19 @@ async def enhanced_ai_chat(
         logger.error(f"Enhanced AI chat error: {e}")
         raise HTTPException(status_code=500, detail="Enhanced AI chat failed")
 
+_MODULE_TEMPLATE = {"estimated_hours": 10, "difficulty": "beginner"}
+
+@lru_cache(maxsize=512)
+def _build_modules(goals: Tuple[str, ...]) -> Tuple[dict, ...]:
+    """Module scaffold for a goal list; cached and shared, so callers must not mutate it"""
+    return tuple(
+        {
+            "title": f"{goal.title()} Fundamentals",
+            "description": f"Master the basics of {goal}",
+            **_MODULE_TEMPLATE
+        } for goal in goals
+    )
+
 @api_router.post("/ai/personalized-learning-path")
 async def generate_personalized_learning_path(
     request: PersonalizedLearningPathRequest,
@@ -2571,13 +2901,42 @@ async def generate_personalized_learning_path(
 ):
     """Generate AI-powered personalized learning path"""
     try:
-        # Get user's performance data
-        user_answers = await db.user_answers.find({"user_id": current_user.id}).to_list(1000)
+        # Get user's performance data, plus recent conversations when the style must be detected
+        # Only the 20 most recent scores are used, so slice them server-side (oldest first)
+        answers_read = db.user_answers.aggregate([
+            {"$match": {"user_id": current_user.id}},
+            {"$sort": {"answered_at": -1}},
+            {"$limit": 20},
+            {"$sort": {"answered_at": 1}},
+            {"$project": {"points_earned": 1, "_id": 0}}
+        ]).to_list(20)
+        
+        if request.preferred_learning_style:
+            recent_answers = await answers_read
+            recent_messages = []
+        else:
+            # Join the 10 latest messages server-side so only one string comes back
+            recent_answers, recent_messages = await asyncio.gather(
+                answers_read,
+                db.enhanced_ai_conversations.aggregate([
+                    {"$match": {"user_id": current_user.id}},
+                    {"$sort": {"timestamp": -1}},
+                    {"$limit": 10},
+                    {"$group": {"_id": None, "messages": {"$push": {"$ifNull": ["$user_message", ""]}}}},
+                    {"$project": {"_id": 0, "combined": {"$reduce": {
+                        "input": "$messages",
+                        "initialValue": "",
+                        "in": {"$concat": [
+                            "$$value", {"$cond": [{"$eq": ["$$value", ""]}, "", " "]}, "$$this"
+                        ]}
+                    }}}}
+                ]).to_list(1)
+            )
         
         # Calculate performance metrics
         performance_data = {
             "topic_accuracy": {},
-            "recent_scores": [answer.get("points_earned", 0) for answer in user_answers[-20:]],
+            "recent_scores": [answer.get("points_earned", 0) for answer in recent_answers],
             "retention_tests": [],  # Would be populated with actual retention data
             "average_session_length": 30  # Default
         }
@@ -2587,13 +2946,8 @@ async def generate_personalized_learning_path(
             learning_style = LearningStyle(request.preferred_learning_style)
         else:
             # Analyze user's interaction patterns to determine learning style
-            recent_interactions = await db.enhanced_ai_conversations.find(
-                {"user_id": current_user.id}
-            ).sort("timestamp", -1).limit(10).to_list(10)
-            
-            if recent_interactions:
-                combined_text = " ".join([interaction.get("user_message", "") for interaction in recent_interactions])
-                learning_style = advanced_ai_engine.detect_learning_style_from_text(combined_text)
+            if recent_messages:
+                learning_style = advanced_ai_engine.detect_learning_style_from_text(recent_messages[0]["combined"])
             else:
                 learning_style = LearningStyle.MULTIMODAL  # Default
         
@@ -2603,14 +2957,7 @@ async def generate_personalized_learning_path(
             "subject": request.subject,
             "learning_goals": request.learning_goals,
             "learning_style": learning_style.value,
-            "modules": [
-                {
-                    "title": f"{goal.title()} Fundamentals",
-                    "description": f"Master the basics of {goal}",
-                    "estimated_hours": 10,
-                    "difficulty": "beginner"
-                } for goal in request.learning_goals
-            ],
+            "modules": list(_build_modules(tuple(request.learning_goals))),
             "immediate_next_steps": [
                 f"Start with {request.learning_goals[0]} basics",
                 "Complete diagnostic assessment",
@@ -2632,6 +2979,7 @@ async def generate_personalized_learning_path(
             "status": "active"
         }
         
+        # User data, not an audit log: write durably before responding
         await db.learning_paths.insert_one(path_data)
         
         return {
@@ -2661,31 +3009,31 @@ async def get_emotional_analytics(
         # Get emotional data from recent interactions
         start_date = datetime.now(timezone.utc) - timedelta(days=days)
         
-        voice_interactions = await db.voice_interactions.find({
-            "user_id": user_id,
-            "timestamp": {"$gte": start_date}
-        }).to_list(1000)
-        
-        ai_conversations = await db.enhanced_ai_conversations.find({
-            "user_id": user_id,
-            "timestamp": {"$gte": start_date}
-        }).to_list(1000)
-        
-        # Analyze emotional patterns
-        emotional_states = []
-        learning_styles = []
-        
-        for interaction in voice_interactions + ai_conversations:
-            if "emotional_state" in interaction:
-                emotional_states.append(interaction["emotional_state"])
-            if "learning_style" in interaction:
-                learning_styles.append(interaction["learning_style"])
-        
-        # Calculate analytics
-        from collections import Counter
-        
-        emotion_distribution = dict(Counter(emotional_states))
-        learning_style_distribution = dict(Counter(learning_styles))
+        interaction_filter = {"user_id": user_id, "timestamp": {"$gte": start_date}}
+        
+        # Histogram both collections server-side; only the per-category counts come back
+        distributions = await db.voice_interactions.aggregate([
+            {"$match": interaction_filter},
+            {"$unionWith": {
+                "coll": "enhanced_ai_conversations",
+                "pipeline": [{"$match": interaction_filter}]
+            }},
+            {"$facet": {
+                "emotions": [
+                    {"$match": {"emotional_state": {"$exists": True}}},
+                    {"$group": {"_id": "$emotional_state", "count": {"$sum": 1}}}
+                ],
+                "learning_styles": [
+                    {"$match": {"learning_style": {"$exists": True}}},
+                    {"$group": {"_id": "$learning_style", "count": {"$sum": 1}}}
+                ]
+            }}
+        ]).to_list(1)
+        facets = distributions[0] if distributions else {"emotions": [], "learning_styles": []}
+        
+        emotion_distribution = {row["_id"]: row["count"] for row in facets["emotions"]}
+        learning_style_distribution = {row["_id"]: row["count"] for row in facets["learning_styles"]}
+        total_emotional_states = sum(emotion_distribution.values())
         
         # Identify trends
         predominant_emotion = max(emotion_distribution, key=emotion_distribution.get) if emotion_distribution else "focused"
@@ -2693,19 +3041,19 @@ async def get_emotional_analytics(
         
         # Generate insights
         insights = []
-        if emotion_distribution.get("frustrated", 0) > len(emotional_states) * 0.3:
+        if emotion_distribution.get("frustrated", 0) > total_emotional_states * 0.3:
             insights.append("Student shows signs of frequent frustration - consider adjusting difficulty level")
         
-        if emotion_distribution.get("confident", 0) > len(emotional_states) * 0.6:
+        if emotion_distribution.get("confident", 0) > total_emotional_states * 0.6:
             insights.append("Student is very confident - consider introducing more challenging material")
         
-        if emotion_distribution.get("bored", 0) > len(emotional_states) * 0.2:
+        if emotion_distribution.get("bored", 0) > total_emotional_states * 0.2:
             insights.append("Student shows signs of boredom - consider more engaging content")
         
         return {
             "user_id": user_id,
             "analysis_period_days": days,
-            "total_interactions": len(emotional_states),
+            "total_interactions": total_emotional_states,
             "emotion_distribution": emotion_distribution,
             "learning_style_distribution": learning_style_distribution,
             "predominant_emotion": predominant_emotion,
@@ -2722,6 +3070,57 @@ async def get_emotional_analytics(
         logger.error(f"Emotional analytics error: {e}")
         raise HTTPException(status_code=500, detail="Emotional analytics failed")
 
+# Static scoring tables for the learning style assessment, built once at import
+# One anchored alternation in priority order: a question matching several styles
+# counts for the first, whose empty named group is then m.lastgroup
+_STYLE_RE = re.compile(
+    r"\A(?:" + "|".join(
+        f"(?=.*?(?:{keywords}))(?P<{style}>)"
+        for style, keywords in (
+            ("visual", "visual|picture|diagram"),
+            ("auditory", "audio|listen|sound"),
+            ("kinesthetic", "kinesthetic|movement|hands"),
+            ("reading_writing", "reading|writing|text"),
+        )
+    ) + ")",
+    re.IGNORECASE | re.DOTALL
+)
+_STYLE_SCORE_KEYS = ("visual", "auditory", "kinesthetic", "reading_writing", "multimodal")
+_VALID_STYLE_VALUES = frozenset(s.value for s in LearningStyle)
+
+RECOMMENDATIONS_MAP = {
+    LearningStyle.VISUAL: (
+        "Use diagrams, charts, and mind maps when studying",
+        "Watch educational videos and visual demonstrations",
+        "Color-code notes and use highlighting",
+        "Create visual summaries of concepts"
+    ),
+    LearningStyle.AUDITORY: (
+        "Read study materials out loud",
+        "Join study groups for discussions",
+        "Listen to educational podcasts and audio books",
+        "Use rhymes and mnemonics to remember information"
+    ),
+    LearningStyle.KINESTHETIC: (
+        "Use hands-on activities and experiments",
+        "Take frequent breaks during study sessions",
+        "Use physical movement while learning",
+        "Build models or use manipulatives"
+    ),
+    LearningStyle.READING_WRITING: (
+        "Take detailed notes while studying",
+        "Write summaries and outlines",
+        "Read extensively on topics",
+        "Use written practice problems"
+    ),
+    LearningStyle.MULTIMODAL: (
+        "Combine visual, auditory, and kinesthetic learning",
+        "Use various study methods for different topics",
+        "Adapt your approach based on the material",
+        "Experiment with different learning techniques"
+    )
+}
+
 @api_router.post("/ai/learning-style-assessment")
 async def conduct_learning_style_assessment(
     request: LearningStyleAssessmentRequest,
@@ -2730,41 +3129,42 @@ async def conduct_learning_style_assessment(
     """Conduct a comprehensive learning style assessment"""
     try:
         # Process user responses
-        style_scores = {
-            "visual": 0,
-            "auditory": 0,
-            "kinesthetic": 0,
-            "reading_writing": 0,
-            "multimodal": 0
-        }
+        style_scores = dict.fromkeys(_STYLE_SCORE_KEYS, 0)
         
         # Calculate scores from user responses
         for response in request.responses:
             question = response.get("question", "")
-            answer = response.get("answer", 0)
             
             # Map questions to learning styles (simplified scoring)
-            if "visual" in question.lower() or "picture" in question.lower() or "diagram" in question.lower():
-                style_scores["visual"] += answer
-            elif "audio" in question.lower() or "listen" in question.lower() or "sound" in question.lower():
-                style_scores["auditory"] += answer
-            elif "kinesthetic" in question.lower() or "movement" in question.lower() or "hands" in question.lower():
-                style_scores["kinesthetic"] += answer
-            elif "reading" in question.lower() or "writing" in question.lower() or "text" in question.lower():
-                style_scores["reading_writing"] += answer
+            m = _STYLE_RE.match(question)
+            if m:
+                style_scores[m.lastgroup] += response.get("answer", 0)
         
         # Get user's historical interaction data for additional context
-        voice_interactions = await db.voice_interactions.find(
-            {"user_id": current_user.id}
-        ).to_list(100)
-        
-        ai_conversations = await db.enhanced_ai_conversations.find(
-            {"user_id": current_user.id}
-        ).to_list(100)
-        
-        user_answers = await db.user_answers.find(
-            {"user_id": current_user.id}
-        ).to_list(200)
+        # The three reads are independent, so run them concurrently
+        voice_interactions, ai_conversations, response_time_stats = await asyncio.gather(
+            db.voice_interactions.find(
+                {"user_id": current_user.id},
+                {"learning_style": 1, "_id": 0}
+            ).to_list(100),
+            db.enhanced_ai_conversations.find(
+                {"user_id": current_user.id},
+                {"learning_style": 1, "_id": 0}
+            ).to_list(100),
+            # Bucket response times server-side; only three counters come back
+            db.user_answers.aggregate([
+                {"$match": {"user_id": current_user.id}},
+                {"$limit": 200},
+                {"$project": {"_id": 0, "time_taken": {"$ifNull": ["$time_taken", 60]}}},
+                {"$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "quick": {"$sum": {"$cond": [{"$lt": ["$time_taken", 30]}, 1, 0]}},
+                    "slow": {"$sum": {"$cond": [{"$gt": ["$time_taken", 60]}, 1, 0]}}
+                }}
+            ]).to_list(1)
+        )
+        response_times = response_time_stats[0] if response_time_stats else {"total": 0, "quick": 0, "slow": 0}
         
         # Analyze patterns across all interactions
         learning_style_indicators = {
@@ -2778,20 +3178,17 @@ async def conduct_learning_style_assessment(
         # Analyze voice interactions
         for interaction in voice_interactions:
             style = interaction.get("learning_style")
-            if style and style in [s.value for s in LearningStyle]:
+            if style in _VALID_STYLE_VALUES:
                 learning_style_indicators[LearningStyle(style)] += 2  # Voice interactions are weighted higher
         
         # Analyze AI conversations
         for conversation in ai_conversations:
             style = conversation.get("learning_style")
-            if style and style in [s.value for s in LearningStyle]:
+            if style in _VALID_STYLE_VALUES:
                 learning_style_indicators[LearningStyle(style)] += 1
         
         # Analyze response patterns (simplified)
-        quick_responses = sum(1 for answer in user_answers if answer.get("time_taken", 60) < 30)
-        slow_responses = sum(1 for answer in user_answers if answer.get("time_taken", 60) > 60)
-        
-        if quick_responses > slow_responses:
+        if response_times["quick"] > response_times["slow"]:
             learning_style_indicators[LearningStyle.KINESTHETIC] += 1
         else:
             learning_style_indicators[LearningStyle.READING_WRITING] += 1
@@ -2802,39 +3199,9 @@ async def conduct_learning_style_assessment(
         primary_style = sorted_styles[0][0] if sorted_styles[0][1] > 0 else LearningStyle.MULTIMODAL
         secondary_style = sorted_styles[1][0] if len(sorted_styles) > 1 and sorted_styles[1][1] > 0 else None
         
-        # Generate personalized recommendations
-        recommendations_map = {
-            LearningStyle.VISUAL: [
-                "Use diagrams, charts, and mind maps when studying",
-                "Watch educational videos and visual demonstrations",
-                "Color-code notes and use highlighting",
-                "Create visual summaries of concepts"
-            ],
-            LearningStyle.AUDITORY: [
-                "Read study materials out loud",
-                "Join study groups for discussions",
-                "Listen to educational podcasts and audio books",
-                "Use rhymes and mnemonics to remember information"
-            ],
-            LearningStyle.KINESTHETIC: [
-                "Use hands-on activities and experiments",
-                "Take frequent breaks during study sessions",
-                "Use physical movement while learning",
-                "Build models or use manipulatives"
-            ],
-            LearningStyle.READING_WRITING: [
-                "Take detailed notes while studying",
-                "Write summaries and outlines",
-                "Read extensively on topics",
-                "Use written practice problems"
-            ],
-            LearningStyle.MULTIMODAL: [
-                "Combine visual, auditory, and kinesthetic learning",
-                "Use various study methods for different topics",
-                "Adapt your approach based on the material",
-                "Experiment with different learning techniques"
-            ]
-        }
+        recommendations = list(RECOMMENDATIONS_MAP.get(primary_style, RECOMMENDATIONS_MAP[LearningStyle.MULTIMODAL]))
+        
+        assessment_date = datetime.now(timezone.utc)
         
         # Store assessment results
         assessment_result = {
@@ -2843,9 +3210,9 @@ async def conduct_learning_style_assessment(
             "secondary_learning_style": secondary_style.value if secondary_style else None,
             "style_distribution": {style.value: score for style, score in learning_style_indicators.items()},
             "confidence_score": min(100, max(10, sorted_styles[0][1] * 10)),
-            "data_points_analyzed": len(voice_interactions) + len(ai_conversations) + len(user_answers),
-            "recommendations": recommendations_map.get(primary_style, recommendations_map[LearningStyle.MULTIMODAL]),
-            "assessment_date": datetime.now(timezone.utc).isoformat()
+            "data_points_analyzed": len(voice_interactions) + len(ai_conversations) + response_times["total"],
+            "recommendations": recommendations,
+            "assessment_date": assessment_date.isoformat()
         }
         
         await db.learning_style_assessments.insert_one(assessment_result)
@@ -2855,9 +3222,9 @@ async def conduct_learning_style_assessment(
             "primary_learning_style": primary_style.value,
             "secondary_learning_style": secondary_style.value if secondary_style else None,
             "confidence_score": min(100, max(10, sorted_styles[0][1] * 10)),
-            "recommendations": recommendations_map.get(primary_style, recommendations_map[LearningStyle.MULTIMODAL]),
-            "data_points_analyzed": len(voice_interactions) + len(ai_conversations) + len(user_answers),
-            "assessment_date": datetime.now(timezone.utc).isoformat()
+            "recommendations": recommendations,
+            "data_points_analyzed": len(voice_interactions) + len(ai_conversations) + response_times["total"],
+            "assessment_date": assessment_date  # orjson emits the same ISO 8601 form
         }
         
     except Exception as e:
@@ -2874,5 +3241,9 @@ app.include_router(api_router)
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
+    if timestamp_ticker_task:
+        timestamp_ticker_task.cancel()
+    await stop_audit_writer()
+    await close_http_clients()
     client.close()
     logger.info("StarGuide API shutting down...")
\ No newline at end of file
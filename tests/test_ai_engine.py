@@ -0,0 +1,129 @@
+"""
+Unit tests for the advanced AI engine (backend/ai_engine.py)
+"""
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+import ai_engine
+from ai_engine import AdvancedAIEngine, _KeywordMatcher
+
+
+class ResponseCacheTest(unittest.IsolatedAsyncioTestCase):
+    """Tutor responses are cached unless the sampling temperature is high"""
+
+    def setUp(self):
+        self.engine = AdvancedAIEngine()
+        self.calls = []
+        patcher = patch.object(ai_engine, "openai_chat", self.chat)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def chat(self, **kwargs):
+        self.calls.append(kwargs)
+        message = SimpleNamespace(content=f"answer {len(self.calls)}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def test_repeat_prompt_served_from_cache(self):
+        """The same prompt and message only reach OpenAI once"""
+        first = await self.engine._generate_openai_response("hello", "system", {})
+        second = await self.engine._generate_openai_response("hello", "system", {})
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.calls), 1)
+
+    async def test_prompt_and_temperature_are_part_of_the_key(self):
+        """A different system prompt or temperature is a cache miss"""
+        await self.engine._generate_openai_response("hello", "system", {})
+        await self.engine._generate_openai_response("hello", "other system", {})
+        await self.engine._generate_openai_response("hello", "system", {}, temperature=0.2)
+
+        self.assertEqual(len(self.calls), 3)
+
+    async def test_high_temperature_bypasses_cache(self):
+        """Above RESPONSE_CACHE_MAX_TEMPERATURE every call goes to OpenAI"""
+        temperature = ai_engine.RESPONSE_CACHE_MAX_TEMPERATURE + 0.1
+        first = await self.engine._generate_openai_response("hello", "system", {}, temperature=temperature)
+        second = await self.engine._generate_openai_response("hello", "system", {}, temperature=temperature)
+
+        self.assertNotEqual(first, second)
+        self.assertEqual([c["temperature"] for c in self.calls], [temperature, temperature])
+        self.assertEqual(len(self.engine._response_cache), 0)
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    """Single keywords match whole words only; phrases match as substrings"""
+
+    CLASSIFIER = {
+        "stuck": ["hard", "do", "confused"],
+        "curious": ["why", "got it", "hands-on", "confused"],
+    }
+
+    def test_whole_words_only(self):
+        """Keywords don't fire inside longer words ('hard' in 'hardware', 'do' in 'don't')"""
+        matcher = _KeywordMatcher(self.CLASSIFIER)
+
+        self.assertEqual(matcher.matches("my hardware, i don't know"), set())
+        self.assertEqual(matcher.matches("this is hard to do"), {"hard", "do"})
+
+    def test_phrases(self):
+        """Multi-word and hyphenated keywords are found, with or without ahocorasick"""
+        for have_ahocorasick in {ai_engine.HAVE_AHOCORASICK, False}:
+            with self.subTest(have_ahocorasick=have_ahocorasick), \
+                    patch.object(ai_engine, "HAVE_AHOCORASICK", have_ahocorasick):
+                matcher = _KeywordMatcher(self.CLASSIFIER)
+                self.assertEqual(matcher.matches("ok, got it. i like hands-on work"), {"got it", "hands-on"})
+
+    def test_best_label(self):
+        """Most distinct keywords wins (repeats count once), ties go to classifier order, no hits gives None"""
+        matcher = _KeywordMatcher(self.CLASSIFIER)
+
+        self.assertEqual(matcher.best("why? got it"), "curious")
+        self.assertEqual(matcher.best("hard hard hard, but why"), "stuck")
+        self.assertEqual(matcher.best("i'm confused"), "stuck")
+        self.assertIsNone(matcher.best("nothing relevant"))
+
+
+class ChatEncodingTest(unittest.IsolatedAsyncioTestCase):
+    """Token estimates use tiktoken once loaded, and a length estimate otherwise"""
+
+    def setUp(self):
+        for patcher in (
+            patch.object(ai_engine, "_chat_encoding", None),
+            patch.object(ai_engine, "HAVE_TIKTOKEN", True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fake_tiktoken(self, encoding_for_model):
+        patcher = patch.object(ai_engine, "tiktoken", SimpleNamespace(encoding_for_model=encoding_for_model), create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_loaded_encoding_is_used(self):
+        """After a successful load the encoding counts the tokens"""
+        self.fake_tiktoken(lambda model: SimpleNamespace(encode=str.split))
+        await ai_engine.load_chat_encoding()
+
+        self.assertEqual(ai_engine._estimate_tokens("one two three"), 3)
+
+    async def test_failed_load_falls_back_to_length(self):
+        """An unreachable BPE download leaves the length estimate in place"""
+        def offline(model):
+            raise OSError("network unreachable")
+
+        self.fake_tiktoken(offline)
+        with self.assertLogs(ai_engine.logger, "WARNING"):
+            await ai_engine.load_chat_encoding()
+
+        self.assertIsNone(ai_engine._chat_encoding)
+        self.assertEqual(ai_engine._estimate_tokens("x" * 40), 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
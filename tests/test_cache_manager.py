@@ -0,0 +1,90 @@
+"""
+Unit tests for the in-process endpoint cache (backend/cache_manager.py)
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from cache_manager import ttl_cache
+
+
+class TTLCacheTest(unittest.IsolatedAsyncioTestCase):
+    """ttl_cache serves repeats from memory and recomputes a miss only once"""
+
+    def setUp(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+        @ttl_cache(seconds=60)
+        async def endpoint(period: str = "day", current_user=None):
+            self.calls.append(period)
+            await self.release.wait()
+            return {"period": period, "call": len(self.calls)}
+
+        self.endpoint = endpoint
+
+    async def test_concurrent_misses_compute_once(self):
+        """Requests racing on one key share a single computation"""
+        tasks = [asyncio.create_task(self.endpoint(period="day")) for _ in range(5)]
+        await asyncio.sleep(0)
+        self.release.set()
+        results = await asyncio.gather(*tasks)
+
+        self.assertEqual(self.calls, ["day"])
+        self.assertTrue(all(result is results[0] for result in results))
+
+    async def test_late_callers_share_the_lock(self):
+        """Callers arriving while queued waiters remain never compute in parallel"""
+        running = peak = 0
+
+        @ttl_cache(seconds=60)
+        async def uncacheable():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return None  # None is never cached, so every caller computes
+
+        first = [asyncio.create_task(uncacheable()) for _ in range(3)]
+        await asyncio.sleep(0.075)  # first call done, second one running
+        late = [asyncio.create_task(uncacheable()) for _ in range(2)]
+        await asyncio.gather(*first, *late)
+
+        self.assertEqual(peak, 1)
+
+    async def test_key_covers_role_and_arguments(self):
+        """Other query parameters or another role are computed separately"""
+        self.release.set()
+        admin = SimpleNamespace(role="admin")
+        student = SimpleNamespace(role="student")
+
+        await self.endpoint(period="day", current_user=admin)
+        await self.endpoint(period="day", current_user=SimpleNamespace(role="admin"))
+        await self.endpoint(period="week", current_user=admin)
+        await self.endpoint(period="day", current_user=student)
+
+        self.assertEqual(self.calls, ["day", "week", "day"])
+
+    async def test_failed_computation_is_not_cached(self):
+        """An exception propagates and the next call computes again"""
+        failures = [RuntimeError("database down")]
+
+        @ttl_cache(seconds=60)
+        async def flaky():
+            if failures:
+                raise failures.pop()
+            return "ok"
+
+        with self.assertRaises(RuntimeError):
+            await flaky()
+        self.assertEqual(await flaky(), "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+Unit tests for the Cloudflare CDN manager (backend/cdn_manager.py)
+"""
+
+import json
+import os
+import sys
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import httpx
+from cachetools import TTLCache
+from tenacity import wait_none
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from cdn_manager import CACHE_MANIFEST_TTL, CDNConfiguration, CloudflareCDNManager, ContentOptimizer
+from http_clients import CLOUDFLARE_API_BASE
+
+
+class CloudflareTestCase(unittest.IsolatedAsyncioTestCase):
+    """Manager wired to an httpx MockTransport that replays queued statuses"""
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.statuses = []
+        self.manager = CloudflareCDNManager(
+            CDNConfiguration(zone_id="zone", api_token="token", domain="example.com")
+        )
+        self.manager.http = httpx.AsyncClient(
+            base_url=CLOUDFLARE_API_BASE, transport=httpx.MockTransport(self.handle)
+        )
+        # No backoff sleeps between retries in tests
+        no_wait = patch.object(CloudflareCDNManager._request.retry, "wait", wait_none())
+        no_wait.start()
+        self.addCleanup(no_wait.stop)
+
+    async def asyncTearDown(self):
+        await self.manager.http.aclose()
+
+    def handle(self, request):
+        self.requests.append(request)
+        status = self.statuses.pop(0) if self.statuses else 200
+        return httpx.Response(status, json={"success": status == 200, "result": {}})
+
+
+class RetryTest(CloudflareTestCase):
+    """Transient Cloudflare errors are retried; others propagate at once"""
+
+    async def test_transient_error_is_retried(self):
+        """A 429 followed by a 200 succeeds on the second attempt"""
+        self.statuses = [429]
+        result = await self.manager.purge_cache(purge_all=True)
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_persistent_error_raises_after_three_attempts(self):
+        """Repeated 503s give up after three attempts and raise"""
+        self.statuses = [503, 503, 503]
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self.manager.purge_cache(purge_all=True)
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_client_error_is_not_retried(self):
+        """A 400 is permanent: no retry, the error reaches the caller"""
+        self.statuses = [400]
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self.manager.setup_cache_rules()
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_failed_setting_reported_as_partial(self):
+        """One failing zone setting leaves the others applied"""
+        self.statuses = [200, 403]
+        result = await self.manager.optimize_images()
+
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual(len(result["features"]) + len(result["failed"]), 2)
+
+
+class PurgeBatchingTest(CloudflareTestCase):
+    """Selective purges are split to Cloudflare's 30-item limit"""
+
+    async def test_urls_split_into_batches(self):
+        """65 URLs go out as 30 + 30 + 5"""
+        urls = [f"https://example.com/{i}.js" for i in range(65)]
+        result = await self.manager.purge_cache(urls=urls)
+
+        sizes = sorted(len(json.loads(r.content)["files"]) for r in self.requests)
+        self.assertEqual(sizes, [5, 30, 30])
+        self.assertEqual(result, {"status": "success", "type": "selective_purge", "urls_purged": 65})
+
+    async def test_failed_batch_gives_partial_result(self):
+        """A batch that keeps failing is reported, the others still count"""
+        self.statuses = [400]
+        result = await self.manager.purge_by_tags([f"tag-{i}" for i in range(40)])
+
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual(len(result["tags_purged"]), 40 - len(json.loads(self.requests[0].content)["tags"]))
+
+    async def test_nothing_to_purge(self):
+        """No URLs and no purge_all makes no API call"""
+        result = await self.manager.purge_cache()
+
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(self.requests, [])
+
+
+class StatusTest(CloudflareTestCase):
+    """get_cdn_status reports this manager's purge and analytics-cache tallies"""
+
+    async def test_status_counts_purges_and_analytics_lookups(self):
+        """Each purge call and analytics cache lookup is counted once"""
+        await self.manager.purge_cache(urls=[f"https://example.com/{i}.js" for i in range(31)])
+        await self.manager.purge_cache(purge_all=True)
+        await self.manager.get_analytics(days=7)
+        await self.manager.get_analytics(days=7)
+
+        status = self.manager.get_cdn_status()
+        self.assertEqual(status["cache_statistics"], {"cache_hits": 1, "cache_misses": 1, "purge_requests": 3})
+        self.assertEqual(status["analytics_cache_hit_ratio"], 0.5)
+
+
+class ContentOptimizerTest(unittest.TestCase):
+    """Header and manifest caching in ContentOptimizer"""
+
+    def setUp(self):
+        self.optimizer = ContentOptimizer()
+
+    def test_results_do_not_share_state(self):
+        """Editing one result's headers doesn't leak into later results"""
+        first = self.optimizer.optimize_static_assets("/static/app.js")
+        first["optimizations"][0]["value"] = "no-store"
+        first["optimizations"].append({"header": "X-Test", "value": "1"})
+
+        second = self.optimizer.optimize_static_assets("/static/app.js")
+        self.assertEqual(second["optimizations"], [
+            {"header": "Cache-Control", "value": "public, max-age=31536000, immutable"},
+            {"header": "Vary", "value": "Accept-Encoding"},
+            {"header": "Cache-Tag", "value": "static"},
+        ])
+
+    def test_api_paths_get_stale_while_revalidate_and_last_modified(self):
+        """API paths carry stale-while-revalidate and, when known, Last-Modified"""
+        result = self.optimizer.optimize_static_assets(
+            "/api/questions", last_modified=datetime(2025, 7, 10, 18, 44, 24)
+        )
+        headers = {h["header"]: h["value"] for h in result["optimizations"]}
+
+        self.assertEqual(headers["Cache-Control"], "public, max-age=300, stale-while-revalidate=100")
+        self.assertEqual(headers["Last-Modified"], "Thu, 10 Jul 2025 18:44:24 GMT")
+        self.assertNotIn("Last-Modified", {
+            h["header"] for h in self.optimizer.optimize_static_assets("/api/questions")["optimizations"]
+        })
+
+    def test_manifest_reused_then_rebuilt(self):
+        """The serialized manifest is reused per asset set until its TTL passes"""
+        now = [0.0]
+        self.optimizer._manifest_cache = TTLCache(maxsize=8, ttl=CACHE_MANIFEST_TTL, timer=lambda: now[0])
+
+        first = self.optimizer.cache_manifest_bytes(["/b.css", "/a.js"])
+        self.assertIs(self.optimizer.cache_manifest_bytes(["/a.js", "/b.css", "/a.js"]), first)
+
+        now[0] += CACHE_MANIFEST_TTL + 1
+        rebuilt = self.optimizer.cache_manifest_bytes(["/a.js", "/b.css"])
+        self.assertIsNot(rebuilt, first)
+        self.assertEqual(sorted(json.loads(rebuilt)["assets"]), ["/a.js", "/b.css"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Unit tests for the shared HTTP clients (backend/http_clients.py)
+"""
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import openai
+from tenacity import wait_none
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+import http_clients
+from http_clients import close_http_clients, get_cf_client, openai_chat
+
+
+class CloudflareClientTest(unittest.IsolatedAsyncioTestCase):
+    """Pooled Cloudflare clients are shared per API token"""
+
+    async def asyncTearDown(self):
+        await close_http_clients()
+
+    async def test_same_token_reuses_client(self):
+        """Repeated lookups with one token return the same pooled client"""
+        self.assertIs(get_cf_client("token-a"), get_cf_client("token-a"))
+
+    async def test_tokens_get_separate_clients(self):
+        """A second token gets its own client carrying its own credentials"""
+        first = get_cf_client("token-a")
+        second = get_cf_client("token-b")
+
+        self.assertIsNot(first, second)
+        self.assertEqual(first.headers["Authorization"], "Bearer token-a")
+        self.assertEqual(second.headers["Authorization"], "Bearer token-b")
+
+    async def test_close_releases_clients(self):
+        """Closing drops every client; the next lookup builds a fresh one"""
+        client = get_cf_client("token-a")
+        await close_http_clients()
+
+        self.assertTrue(client.is_closed)
+        self.assertEqual(http_clients._cf_clients, {})
+        self.assertIsNot(get_cf_client("token-a"), client)
+
+
+    async def test_openai_client_is_shared(self):
+        """get_openai_client hands out one client until the clients are closed"""
+        key = patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+        key.start()
+        self.addCleanup(key.stop)
+
+        first = http_clients.get_openai_client()
+        self.assertIs(http_clients.get_openai_client(), first)
+
+        await close_http_clients()
+        self.assertIsNot(http_clients.get_openai_client(), first)
+
+
+class OpenAIChatTest(unittest.IsolatedAsyncioTestCase):
+    """openai_chat retries transient errors on the shared client"""
+
+    def setUp(self):
+        self.calls = 0
+        completions = SimpleNamespace(create=self.create)
+        self.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        for patcher in (
+            patch.object(http_clients, "get_openai_client", lambda: self.client),
+            patch.object(openai_chat.retry, "wait", wait_none()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+            raise openai.RateLimitError("slow down", response=httpx.Response(429, request=request), body=None)
+        return kwargs
+
+    async def test_rate_limit_is_retried(self):
+        """A rate-limited call is retried and the second attempt's result returned"""
+        result = await openai_chat(model="gpt-4", messages=[])
+
+        self.assertEqual(result, {"model": "gpt-4", "messages": []})
+        self.assertEqual(self.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
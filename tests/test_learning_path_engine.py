@@ -0,0 +1,253 @@
+"""
+Unit tests for the learning path recommendation engine (backend/learning_path_engine.py)
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+import learning_path_engine
+from learning_path_engine import (
+    AdvancedLearningPathRecommendationEngine,
+    LearningGoal,
+    LearningGoalType,
+    HAVE_NUMBA,
+    LearningPathway,
+    PathwayDifficulty,
+    PathwayStep,
+    PathwayType,
+)
+
+
+def make_goal(**overrides):
+    """A medium-term goal targeting a couple of programming skills"""
+    values = dict(
+        goal_id="goal-1",
+        title="Learn data structures",
+        description="",
+        goal_type=LearningGoalType.MEDIUM_TERM,
+        target_skills=["data_structures", "algorithms"],
+        prerequisites=[],
+        estimated_time=40,
+        priority=0.5,
+        deadline=None,
+        career_relevance=0.3,
+        personal_interest=0.5,
+    )
+    values.update(overrides)
+    return LearningGoal(**values)
+
+
+class RecommendationCacheTest(unittest.IsolatedAsyncioTestCase):
+    """The recommendation cache key covers every input that affects scoring"""
+
+    async def asyncSetUp(self):
+        self.engine = AdvancedLearningPathRecommendationEngine()
+        self.skills = ["programming_basics", "variables_data_types"]
+
+    async def generate(self, preferences, time_constraints=None, goals=None):
+        return await self.engine.generate_personalized_pathways(
+            "user-1", goals or [make_goal()], self.skills, preferences, time_constraints
+        )
+
+    async def test_same_inputs_hit_cache(self):
+        """Identical inputs (preferences in any key order) reuse the cached result"""
+        first = await self.generate({"weekly_hours": 5, "preferred_formats": ["video"]})
+        second = await self.generate({"preferred_formats": ["video"], "weekly_hours": 5})
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.engine.recommendation_cache), 1)
+
+    async def test_preferences_change_key(self):
+        """Changing preferred formats or weekly hours bypasses the cached result"""
+        await self.generate({"weekly_hours": 5, "preferred_formats": ["video"]})
+        await self.generate({"weekly_hours": 5, "preferred_formats": ["article"]})
+        await self.generate({"weekly_hours": 20, "preferred_formats": ["article"]})
+
+        self.assertEqual(len(self.engine.recommendation_cache), 3)
+
+    async def test_time_constraints_change_key(self):
+        """Time constraints are part of the key"""
+        preferences = {"weekly_hours": 5}
+        await self.generate(preferences)
+        await self.generate(preferences, {"max_hours": 10})
+
+        self.assertEqual(len(self.engine.recommendation_cache), 2)
+
+    async def test_resources_built_only_for_recommended_pathways(self):
+        """Candidate steps carry only light pairs; recommended ones get full resources"""
+        built, candidates = [], []
+        build_resources = self.engine._build_skill_resources
+        score_pathways = self.engine._score_pathways
+
+        def tracking_build(skill, preferred_formats):
+            built.append(skill)
+            return build_resources(skill, preferred_formats)
+
+        def score_top_one(pathways, user_context, time_constraints):
+            candidates.extend(pathways)
+            return score_pathways(pathways, user_context, time_constraints, top_k=1)
+
+        goals = [make_goal(target_skills=["html_css", "javascript", "statistics", "data_analysis", "algorithms", "system_design"])]
+        with patch.object(self.engine, "_build_skill_resources", side_effect=tracking_build), \
+                patch.object(self.engine, "_score_pathways", side_effect=score_top_one):
+            recommendations = await self.generate({"preferred_formats": ["video"]}, goals=goals)
+
+        self.assertGreater(len(candidates), 1)
+        self.assertTrue(all(step.resources == [] for pathway in candidates for step in pathway.steps))
+        self.assertEqual(len(recommendations), 1)
+        steps = recommendations[0].pathway.steps
+        self.assertEqual(built, [step.skill for step in steps])
+        for step in steps:
+            self.assertEqual(step.resources_light, tuple((r.resource_type, r.estimated_time) for r in step.resources))
+
+    async def test_goal_changes_change_key(self):
+        """Goal fields used in scoring are part of the key"""
+        preferences = {"weekly_hours": 5}
+        await self.generate(preferences, goals=[make_goal()])
+        await self.generate(preferences, goals=[make_goal(career_relevance=0.9)])
+
+        self.assertEqual(len(self.engine.recommendation_cache), 2)
+
+
+class SkillResourcesTest(unittest.TestCase):
+    """Light (type, time) pairs agree with the full resources"""
+
+    def setUp(self):
+        self.engine = AdvancedLearningPathRecommendationEngine()
+
+    def test_light_pairs_match_resources(self):
+        """Preferred formats are included, topped up to at least two resources"""
+        for formats in [(), ("project",), ("article", "exercise", "quiz"), ("video", "project")]:
+            with self.subTest(formats=formats):
+                preferred = frozenset(formats)
+                resources = self.engine._build_skill_resources("algorithms", preferred)
+                self.assertEqual(
+                    learning_path_engine._skill_resources_light(preferred),
+                    tuple((r.resource_type, r.estimated_time) for r in resources),
+                )
+                self.assertGreaterEqual(len(resources), 2)
+
+    def test_light_pairs_build_no_resources(self):
+        """The light path never constructs LearningResource objects"""
+        with patch.object(learning_path_engine, "LearningResource", side_effect=AssertionError):
+            light = learning_path_engine._skill_resources_light(frozenset({"project"}))
+
+        self.assertEqual(light, (("video", 45), ("article", 30), ("project", 180)))
+
+    def test_resources_cached_per_engine(self):
+        """Each engine memoizes its own immutable resources"""
+        first = self.engine._build_skill_resources("algorithms", frozenset({"project", "quiz"}))
+
+        self.assertIs(self.engine._build_skill_resources("algorithms", frozenset({"project"})), first)
+        self.assertIsNot(
+            AdvancedLearningPathRecommendationEngine()._build_skill_resources("algorithms", frozenset({"project"})),
+            first,
+        )
+        for resource in first:
+            self.assertIsInstance(resource.skills_covered, tuple)
+            self.assertIsInstance(resource.prerequisites, tuple)
+            self.assertIsInstance(resource.tags, tuple)
+
+
+class ScorePathwaysTest(unittest.TestCase):
+    """_score_pathways returns the top_k best first, ties in generation order"""
+
+    def setUp(self):
+        self.engine = AdvancedLearningPathRecommendationEngine()
+        now = datetime(2025, 1, 1)
+        self.pathways = [
+            LearningPathway(
+                pathway_id=f"pathway-{i}", title="", description="",
+                pathway_type=PathwayType.SKILL_BASED, difficulty=PathwayDifficulty.BEGINNER,
+                total_estimated_time=10, steps=[], target_goals=[], skill_outcomes=[],
+                career_paths=[], personalization_score=0.0, success_probability=0.0,
+                created_at=now, updated_at=now,
+            )
+            for i in range(8)
+        ]
+
+    def score(self, scores, top_k=5):
+        with patch.object(self.engine, "_calculate_pathway_scores", return_value=np.array(scores)), \
+                patch.object(self.engine, "_success_probabilities", side_effect=lambda p, _: [0.5] * len(p)):
+            return self.engine._score_pathways(self.pathways, {"preferred_formats": []}, None, top_k=top_k)
+
+    def test_ties_keep_generation_order(self):
+        """Equal scores come back in the order the pathways were generated"""
+        result = self.score([0.5, 0.9, 0.5, 0.5, 0.9, 0.5, 0.1, 0.5])
+
+        self.assertEqual(
+            [p.pathway_id for p, _ in result],
+            ["pathway-1", "pathway-4", "pathway-0", "pathway-2", "pathway-3"],
+        )
+        self.assertEqual([score for _, score in result], [0.9, 0.9, 0.5, 0.5, 0.5])
+
+    def test_top_k_larger_than_candidates(self):
+        """Asking for more than exist returns every pathway"""
+        self.assertEqual(len(self.score([0.2] * 8, top_k=20)), 8)
+
+
+@unittest.skipUnless(HAVE_NUMBA, "numba is not installed")
+class NumbaKernelTest(unittest.TestCase):
+    """The JIT kernels agree with the pure Python/NumPy paths"""
+
+    def setUp(self):
+        self.engine = AdvancedLearningPathRecommendationEngine()
+
+    def make_pathway(self, i, total_time, difficulty, unmet):
+        now = datetime(2025, 1, 1)
+        steps = [
+            PathwayStep(
+                step_id=f"step-{j}", step_number=j, title="", description="", learning_objectives=[],
+                resources=[], estimated_time=60, difficulty_progression=0.5, prerequisites_met=j >= unmet,
+                mastery_criteria={}, optional=False, resources_light=(("video", 45),),
+            )
+            for j in range(4)
+        ]
+        return LearningPathway(
+            pathway_id=f"pathway-{i}", title="", description="", pathway_type=PathwayType.SKILL_BASED,
+            difficulty=difficulty, total_estimated_time=total_time, steps=steps, target_goals=[],
+            skill_outcomes=[], career_paths=[], personalization_score=0.0, success_probability=0.0,
+            created_at=now, updated_at=now,
+        )
+
+    def test_score_kernel_matches_numpy(self):
+        """_score_kernel gives the NumPy scores, and so the same ranking among ties"""
+        rng = np.random.default_rng(0)
+        n_pathways, n_skills = 12, 27
+        skill_mat = (rng.random((n_pathways, n_skills)) < 0.3).astype(np.float64)
+        skill_mat[6:] = skill_mat[:6]  # duplicated pathways tie
+        goal_vec = (rng.random(n_skills) < 0.4).astype(np.float64)
+        features = [np.tile(rng.random(6), 2) for _ in range(4)]
+        args = (skill_mat, goal_vec, float(max(goal_vec.sum(), 1)), *features)
+
+        jit_scores = learning_path_engine._score_kernel(*args)
+        numpy_scores = learning_path_engine._score_kernel_numpy(*args)
+
+        np.testing.assert_allclose(jit_scores, numpy_scores, rtol=1e-12)
+        np.testing.assert_array_equal(
+            np.argsort(-jit_scores, kind="stable"), np.argsort(-numpy_scores, kind="stable")
+        )
+
+    def test_success_kernel_matches_python(self):
+        """_success_kernel reproduces _calculate_success_probability"""
+        difficulties = list(PathwayDifficulty)
+        pathways = [
+            self.make_pathway(i, total_time, difficulties[i % len(difficulties)], i % 5)
+            for i, total_time in enumerate([10, 60, 119, 120, 121, 400, 900])
+        ]
+        for skill_count in (0, 1, 3, 6):
+            with self.subTest(skill_count=skill_count):
+                context = {"time_budget": 10, "_skill_count": skill_count}
+                expected = [self.engine._calculate_success_probability(p, context) for p in pathways]
+                np.testing.assert_allclose(self.engine._success_probabilities(pathways, context), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+"""
+Unit tests for the MLOps model manager (backend/mlops_manager.py)
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+import mlops_manager
+from mlops_manager import DeploymentEnvironment, ExperimentTracker, MLModelManager, ModelMonitor, ModelType
+
+
+class DoublingModel:
+    """Picklable stand-in model with a predict method"""
+
+    def predict(self, data):
+        return np.asarray(data) * 2
+
+
+class SummingModel:
+    """Collapses a batch into one row, as a misbehaving batch model would"""
+
+    def predict(self, data):
+        return np.asarray(data).sum(axis=0, keepdims=True)
+
+
+class MLModelManagerTest(unittest.IsolatedAsyncioTestCase):
+    """Prediction path and prediction history of MLModelManager"""
+
+    async def asyncSetUp(self):
+        self.store = tempfile.TemporaryDirectory()
+        self.manager = MLModelManager(model_store_path=self.store.name)
+        self.model_id = await self.manager.register_model(
+            "doubler", ModelType.RECOMMENDATION, DoublingModel()
+        )
+        await self.manager.deploy_model(self.model_id, DeploymentEnvironment.DEVELOPMENT)
+
+    async def asyncTearDown(self):
+        self.store.cleanup()
+
+    async def test_predict_then_read_history(self):
+        """predict() records each call in the prediction history"""
+        first = await self.manager.predict(self.model_id, DeploymentEnvironment.DEVELOPMENT, [1, 2])
+        second = await self.manager.predict(self.model_id, DeploymentEnvironment.DEVELOPMENT, [3])
+
+        self.assertEqual(first["prediction"], [2, 4])
+        history = self.manager.get_prediction_history(self.model_id)
+        self.assertEqual([h["prediction_id"] for h in history],
+                         [first["prediction_id"], second["prediction_id"]])
+
+        performance = await self.manager.get_model_performance(self.model_id)
+        self.assertNotIn("error", performance)
+        self.assertEqual(performance["total_predictions"], 2)
+        self.assertEqual(performance["last_prediction_at"], second["timestamp"])
+
+    async def test_history_limit(self):
+        """limit returns the most recent entries, oldest first"""
+        ids = [
+            (await self.manager.predict(self.model_id, DeploymentEnvironment.DEVELOPMENT, [i]))["prediction_id"]
+            for i in range(5)
+        ]
+        history = self.manager.get_prediction_history(self.model_id, limit=2)
+        self.assertEqual([h["prediction_id"] for h in history], ids[-2:])
+        self.assertEqual(self.manager.get_prediction_history(self.model_id, limit=0), [])
+        self.assertEqual(self.manager.get_prediction_history("unknown"), [])
+
+    async def test_predict_batch_and_coalesced(self):
+        """Batched and coalesced predictions are logged like single ones"""
+        results = await self.manager.predict_batch(
+            self.model_id, DeploymentEnvironment.DEVELOPMENT, [np.array([1.0]), np.array([2.0])]
+        )
+        self.assertEqual([r["prediction"] for r in results], [[2.0], [4.0]])
+
+        coalesced = await self.manager.predict_coalesced(
+            self.model_id, DeploymentEnvironment.DEVELOPMENT, np.array([5.0])
+        )
+        self.assertEqual(coalesced["prediction"], [10.0])
+        self.assertEqual(len(self.manager.get_prediction_history(self.model_id)), 3)
+
+    async def test_row_count_mismatch_is_reported(self):
+        """A model returning the wrong number of rows fails every waiter with a ValueError"""
+        model_id = await self.manager.register_model("summer", ModelType.RECOMMENDATION, SummingModel())
+        await self.manager.deploy_model(model_id, DeploymentEnvironment.DEVELOPMENT)
+
+        with self.assertRaisesRegex(ValueError, "returned 1 predictions for 2 inputs"):
+            await self.manager.predict_batch(
+                model_id, DeploymentEnvironment.DEVELOPMENT, [np.array([1.0]), np.array([2.0])]
+            )
+
+        results = await asyncio.gather(*(
+            self.manager.predict_coalesced(model_id, DeploymentEnvironment.DEVELOPMENT, np.array([float(i)]))
+            for i in range(3)
+        ), return_exceptions=True)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+    async def test_history_wraps_around(self):
+        """Past PREDICTION_HISTORY_SIZE the oldest entries are overwritten"""
+        with patch.object(mlops_manager, "PREDICTION_HISTORY_SIZE", 3):
+            ids = [
+                (await self.manager.predict(self.model_id, DeploymentEnvironment.DEVELOPMENT, [i]))["prediction_id"]
+                for i in range(7)
+            ]
+            history = self.manager.get_prediction_history(self.model_id)
+            recent = self.manager.get_prediction_history(self.model_id, limit=2)
+            performance = await self.manager.get_model_performance(self.model_id)
+
+        self.assertEqual([h["prediction_id"] for h in history], ids[-3:])
+        self.assertEqual([h["prediction_id"] for h in recent], ids[-2:])
+        self.assertEqual(performance["total_predictions"], 7)
+
+
+class CompareExperimentsTest(unittest.IsolatedAsyncioTestCase):
+    """Best experiment by accuracy, falling back to f1_score"""
+
+    async def asyncSetUp(self):
+        self.tracker = ExperimentTracker()
+
+    async def start(self, **metrics):
+        experiment_id = await self.tracker.start_experiment("run", "model", {})
+        await self.tracker.log_metrics(experiment_id, metrics)
+        return experiment_id
+
+    async def test_best_by_accuracy_then_f1(self):
+        """f1_score stands in for a missing accuracy"""
+        ids = [await self.start(accuracy=0.7), await self.start(f1_score=0.8), await self.start(loss=0.1)]
+        comparison = await self.tracker.compare_experiments(ids)
+
+        self.assertEqual(comparison["best_experiment"], ids[1])
+        self.assertEqual([v["value"] for v in comparison["metrics_comparison"]["accuracy"]], [0.7, None, None])
+
+    async def test_no_best_without_positive_scores(self):
+        """Missing or zero scores leave best_experiment as None"""
+        ids = [await self.start(), await self.start(accuracy=0.0), await self.start(loss=0.3)]
+        comparison = await self.tracker.compare_experiments(ids)
+
+        self.assertIsNone(comparison["best_experiment"])
+        self.assertEqual(len(comparison["experiments"]), 3)
+
+
+class DriftWindowTest(unittest.IsolatedAsyncioTestCase):
+    """Running Welford stats track the last DRIFT_WINDOW_SIZE predictions"""
+
+    async def test_window_stats_match_numpy(self):
+        """Mean and std agree with numpy over the window after it wraps"""
+        rng = np.random.default_rng(0)
+        batches = [rng.normal(10.0, 2.0, size) for size in (20, 35, 1, 60, 13)]
+        monitor = ModelMonitor()
+
+        with patch.object(mlops_manager, "DRIFT_WINDOW_SIZE", 50):
+            results = [await monitor.monitor_model_drift("model", batch.tolist()) for batch in batches]
+
+        window = np.concatenate(batches)[-50:]
+        monitoring = monitor.monitoring_data["model"]
+        self.assertEqual(monitoring["count"], 50)
+        self.assertAlmostEqual(monitoring["mean"], window.mean(), places=9)
+        self.assertAlmostEqual(np.sqrt(monitoring["M2"] / monitoring["count"]), window.std(), places=9)
+
+        self.assertEqual(results[0]["status"], "baseline_set")
+        self.assertAlmostEqual(results[0]["baseline_mean"], batches[0].mean(), places=9)
+        self.assertEqual(results[-1]["current_mean"], round(window.mean(), 4))
+
+    async def test_accumulated_error_is_reanchored(self):
+        """Rounding error in the running state is discarded when the window wraps"""
+        monitor = ModelMonitor()
+        with patch.object(mlops_manager, "DRIFT_WINDOW_SIZE", 8):
+            await monitor.monitor_model_drift("model", [1e9 + i for i in range(5)])
+            monitoring = monitor.monitoring_data["model"]
+            monitoring["mean"] += 1e-3  # as if drifted over millions of updates
+            monitoring["M2"] += 5.0
+            await monitor.monitor_model_drift("model", [1e9 + i for i in range(5, 11)])
+
+        window = 1e9 + np.arange(3, 11, dtype=np.float64)
+        self.assertEqual(monitoring["head"], 3)
+        self.assertAlmostEqual(monitoring["mean"], window.mean(), places=6)
+        self.assertAlmostEqual(monitoring["M2"] / monitoring["count"], window.var(), places=6)
+
+    async def test_window_of_constant_values(self):
+        """A full window of one value has zero spread"""
+        monitor = ModelMonitor()
+        with patch.object(mlops_manager, "DRIFT_WINDOW_SIZE", 4):
+            await monitor.monitor_model_drift("model", [1.0, 9.0, 3.0])
+            await monitor.monitor_model_drift("model", [5.0] * 6)
+
+        monitoring = monitor.monitoring_data["model"]
+        self.assertAlmostEqual(monitoring["mean"], 5.0)
+        self.assertAlmostEqual(monitoring["M2"], 0.0, places=9)
+
+
+if __name__ == "__main__":
+    unittest.main()